@@ -3,7 +3,7 @@
 
 import datetime
 import functools
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from enum import Enum, IntEnum
 from re import Match
 from typing import (
@@ -20,6 +20,7 @@ import gitlab
 import pyforgejo
 import requests
 
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.deprecation import deprecate_and_set_removal
 from ogr.exceptions import (
     APIException,
@@ -649,6 +650,18 @@ class PullRequest(OgrAbstractClass):
         """Patch of the pull request."""
         raise NotImplementedError()
 
+    def iter_patch(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Stream patch of the pull request without holding it in memory.
+
+        Args:
+            chunk_size: Size of the chunks in bytes.
+
+        Returns:
+            Iterator over chunks of the patch.
+        """
+        raise NotImplementedError()
+
     @property
     def head_commit(self) -> str:
         """Commit hash of the HEAD commit of the pull request."""
@@ -1241,12 +1254,30 @@ class Release(OgrAbstractClass):
         """
         raise NotImplementedError()
 
-    def save_archive(self, filename: str) -> None:
+    def save_archive(
+        self,
+        filename: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+        resume: bool = False,
+    ) -> None:
         """
         Save tarball of the release to requested `filename`.
 
+        The tarball is streamed to the file in chunks.
+
         Args:
             filename: Path to the file to save archive to.
+            chunk_size: Size of the chunks in bytes.
+            checksum: Expected SHA-256 hex digest of the tarball.
+
+                Defaults to `None`, which means the tarball is not verified.
+            resume: Continue with partially downloaded `filename`.
+
+                Defaults to `False`.
+
+        Raises:
+            ChecksumMismatchError, if the digest does not match the `checksum`.
         """
         raise NotImplementedError()
 
@@ -1264,6 +1295,7 @@ class Release(OgrAbstractClass):
 class AuthMethod(str, Enum):
     tokman = "tokman"
     github_app = "github_app"
+    token_pool = "token_pool"
     token = "token"
 
 
@@ -1271,9 +1303,13 @@ class GitService(OgrAbstractClass):
     """
     Attributes:
         instance_url (str): URL of the git forge instance.
+        download_timeout (Optional[tuple[float, float]]): Connect and read
+            timeout (in seconds) of the downloads of raw content, `None`
+            waits indefinitely.
     """
 
     instance_url: Optional[str] = None
+    download_timeout: Optional[tuple[float, float]] = None
 
     def __init__(self, **_: Any) -> None:
         pass
@@ -1281,6 +1317,21 @@ class GitService(OgrAbstractClass):
     def __str__(self) -> str:
         return f"GitService(instance_url={self.instance_url})"
 
+    @property
+    def download_session(self) -> requests.Session:
+        """Session used for downloads of raw content, e.g. patches or archives."""
+        raise NotImplementedError
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        """
+        Args:
+            url: URL to be downloaded.
+
+        Returns:
+            Headers (e.g. authentication) to be sent with the download request.
+        """
+        raise NotImplementedError
+
     def get_project(self, **kwargs: Any) -> "GitProject":
         """
         Get the requested project.
@@ -1941,6 +1992,18 @@ class GitProject(OgrAbstractClass):
         """
         raise NotImplementedError()
 
+    def get_latest_commit_statuses(self, commit: str) -> list[CommitFlag]:
+        """
+        Get the latest status of each context on the commit.
+
+        Args:
+            commit: Hash of the commit.
+
+        Returns:
+            List of commit statuses, one per context.
+        """
+        raise NotImplementedError()
+
     def get_git_urls(self) -> dict[str, str]:
         """
         Get git URLs for the project.
@@ -1995,6 +2058,30 @@ class GitProject(OgrAbstractClass):
         """
         raise NotImplementedError
 
+    def iter_file_content(
+        self,
+        path: str,
+        ref: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Stream raw content of the file in the repo without holding it in memory.
+
+        Args:
+            path: Path to the file.
+            ref: Branch or commit.
+
+                Defaults to repo's default branch.
+            chunk_size: Size of the chunks in bytes.
+
+        Returns:
+            Iterator over chunks of the file.
+
+        Raises:
+            FileNotFoundError: if there is no such file.
+        """
+        raise NotImplementedError
+
     def get_files(
         self,
         ref: Optional[str] = None,
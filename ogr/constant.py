@@ -3,3 +3,4 @@
 
 CLONE_TIMEOUT = 60
 DEFAULT_RO_PREFIX_STRING = "READ ONLY: "
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
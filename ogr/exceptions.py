@@ -98,3 +98,7 @@ class GitForgeInternalError(OgrNetworkError):
 
 class GithubAppNotInstalledError(OgrException):
     """Exception raised when GitHub App is not installed."""
+
+
+class ChecksumMismatchError(OgrException):
+    """Exception raised when checksum of the downloaded content does not match."""
@@ -1,8 +1,11 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from typing import Any, Optional
-from urllib.request import urlopen
+import math
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+import requests
 
 from ogr.abstract import (
     CommitFlag,
@@ -15,9 +18,16 @@ from ogr.abstract import (
     PullRequest,
     Release,
 )
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import OgrException
 from ogr.parsing import parse_git_repo
-from ogr.utils import filter_comments, search_in_comments
+from ogr.utils import (
+    SingleFlight,
+    TTLCache,
+    download_file,
+    filter_comments,
+    search_in_comments,
+)
 
 try:
     from functools import cached_property
@@ -29,23 +39,70 @@ except ImportError:
 
 
 class BaseGitService(GitService):
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # concurrent identical read requests share one call
+        self.single_flight = SingleFlight()
+        self._usernames = TTLCache(max_size=16, ttl=math.inf)
+
     @cached_property
     def hostname(self) -> Optional[str]:
         parsed_url = parse_git_repo(potential_url=self.instance_url)
         return parsed_url.hostname if parsed_url else None
 
+    @cached_property
+    def download_session(self) -> requests.Session:
+        return requests.Session()
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        return {}
+
     def get_project_from_url(self, url: str) -> "GitProject":
         repo_url = parse_git_repo(potential_url=url)
         if not repo_url:
             raise OgrException(f"Cannot parse project url: '{url}'")
         return self.get_project(repo=repo_url.repo, namespace=repo_url.namespace)
 
+    @property
+    def _identity_key(self) -> Hashable:
+        """Identifies the credentials that the service authenticates with."""
+        return None
+
+    def get_cached_username(self, get_username: Callable[[], str]) -> str:
+        """
+        Get login of the authenticated user, fetched once per credentials.
+
+        Args:
+            get_username: Function fetching the login from the forge.
+
+        Returns:
+            Login of the authenticated user.
+        """
+        key = self._identity_key
+        username = self._usernames.get(key)
+        if username is None:
+            username = self.single_flight.do(("username", key), get_username)
+            self._usernames.set(key, username)
+        return username
+
+    def invalidate_identity(self) -> None:
+        """Forget the cached logins, e.g. after the credentials have changed."""
+        self._usernames.clear()
+
 
 class BaseGitProject(GitProject):
     @property
     def full_repo_name(self) -> str:
         return f"{self.namespace}/{self.repo}"
 
+    def get_latest_commit_statuses(self, commit: str) -> list[CommitFlag]:
+        latest: dict[str, CommitFlag] = {}
+        for flag in self.get_commit_statuses(commit):
+            current = latest.get(flag.context)
+            if current is None or flag.created > current.created:
+                latest[flag.context] = flag
+        return list(latest.values())
+
 
 class BasePullRequest(PullRequest):
     @property
@@ -78,8 +135,7 @@ class BasePullRequest(PullRequest):
         return search_in_comments(comments=all_comments, filter_regex=filter_regex)
 
     def get_statuses(self) -> list[CommitFlag]:
-        commit = self.get_all_commits()[-1]
-        return self.target_project.get_commit_statuses(commit)
+        return self.target_project.get_commit_statuses(self.head_commit)
 
 
 class BaseGitUser(GitUser):
@@ -116,9 +172,21 @@ class BaseCommitFlag(CommitFlag):
 
 
 class BaseRelease(Release):
-    def save_archive(self, filename: str) -> None:
-        response = urlopen(self.tarball_url)
-        data = response.read()
-
-        with open(filename, "wb") as file:
-            file.write(data)
+    def save_archive(
+        self,
+        filename: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+        resume: bool = False,
+    ) -> None:
+        service = self.project.service
+        download_file(
+            service.download_session,
+            self.tarball_url,
+            filename,
+            chunk_size=chunk_size,
+            checksum=checksum,
+            resume=resume,
+            headers=service.get_download_headers(self.tarball_url),
+            timeout=service.download_timeout,
+        )
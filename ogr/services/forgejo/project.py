@@ -1,11 +1,16 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-
+from collections.abc import Iterator
 from functools import cached_property
+from typing import Optional
+from urllib.parse import quote
 
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
+from ogr.exceptions import ForgejoAPIException, OgrNetworkError
 from ogr.services import forgejo
 from ogr.services.base import BaseGitProject
+from ogr.utils import iter_response_content
 
 
 class ForgejoProject(BaseGitProject):
@@ -28,3 +33,36 @@ class ForgejoProject(BaseGitProject):
             owner=namespace,
             repo=self.repo,
         )
+
+    @property
+    def api_url(self) -> str:
+        namespace = self.namespace or self.service.user.get_username()
+        return f"{self.service.instance_url}/repos/{namespace}/{self.repo}"
+
+    def iter_file_content(
+        self,
+        path: str,
+        ref: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        url = f"{self.api_url}/raw/{quote(path)}"
+        # Forgejo falls back to the default branch when no ref is given
+        params = {"ref": ref} if ref else {}
+
+        response = self.service.download_session.get(
+            url,
+            params=params,
+            headers=self.service.get_download_headers(url),
+            stream=True,
+            timeout=self.service.download_timeout,
+        )
+        if not response.ok:
+            response.close()
+            if response.status_code == 404:
+                raise FileNotFoundError(f"File '{path}' on {ref} not found")
+            cls = (
+                OgrNetworkError if response.status_code >= 500 else ForgejoAPIException
+            )
+            raise cls(f"Couldn't get file '{path}' on {ref}: {response.reason}")
+
+        return iter_response_content(response, chunk_size)
@@ -1,16 +1,41 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+from collections.abc import Iterator
 from typing import Any
 
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
+from ogr.exceptions import ForgejoAPIException, OgrNetworkError
 from ogr.services import forgejo
 from ogr.services.base import BasePullRequest
+from ogr.utils import iter_response_content
 
 
 class ForgejoPullRequest(BasePullRequest):
+    _target_project: "forgejo.ForgejoProject"
+
     def __init__(
         self,
         raw_pr: Any,
         project: "forgejo.ForgejoProject",
     ):
         super().__init__(raw_pr, project)
+
+    def iter_patch(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        service = self._target_project.service
+        url = f"{self._target_project.api_url}/pulls/{self._raw_pr.number}.patch"
+        response = service.download_session.get(
+            url,
+            headers=service.get_download_headers(url),
+            stream=True,
+            timeout=service.download_timeout,
+        )
+
+        if not response.ok:
+            response.close()
+            cls = (
+                OgrNetworkError if response.status_code >= 500 else ForgejoAPIException
+            )
+            raise cls(f"Couldn't get patch from {url} because {response.reason}.")
+
+        return iter_response_content(response, chunk_size)
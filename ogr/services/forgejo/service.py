@@ -28,6 +28,8 @@ class ForgejoService(BaseGitService):
     ):
         super().__init__()
         self.instance_url = instance_url + self.version
+        self._web_url = instance_url
+        self._api_key = api_key
         self._token = f"token {api_key}"
         self._api = None
 
@@ -35,6 +37,16 @@ class ForgejoService(BaseGitService):
     def api(self):
         return PyforgejoApi(base_url=self.instance_url, api_key=self._token)
 
+    @property
+    def _identity_key(self) -> str:
+        return self._token
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        # the token is not sent to other hosts
+        if not self._api_key or not url.startswith(f"{self._web_url.rstrip('/')}/"):
+            return {}
+        return {"Authorization": self._token}
+
     def get_project(  # type: ignore[override]
         self,
         repo: str,
@@ -23,4 +23,4 @@ class ForgejoUser(BaseGitUser):
         return self.service.api.user.get_current()
 
     def get_username(self) -> str:
-        return self.forgejo_user.login
+        return self.service.get_cached_username(lambda: self.forgejo_user.login)
@@ -6,6 +6,7 @@ from ogr.services.github.comments import GithubIssueComment, GithubPRComment
 from ogr.services.github.issue import GithubIssue
 from ogr.services.github.project import GithubProject
 from ogr.services.github.pull_request import GithubPullRequest
+from ogr.services.github.rate_limit import RateLimitScheduler
 from ogr.services.github.release import GithubRelease
 from ogr.services.github.service import GithubService
 from ogr.services.github.user import GithubUser
@@ -20,4 +21,5 @@ __all__ = [
     GithubUser.__name__,
     GithubProject.__name__,
     GithubService.__name__,
+    RateLimitScheduler.__name__,
 ]
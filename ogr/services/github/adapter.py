@@ -0,0 +1,260 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import github
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ogr.exceptions import OgrException
+from ogr.services.github.rate_limit import RateLimitScheduler
+from ogr.utils import TTLCache
+
+if TYPE_CHECKING:
+    from ogr.services.github.auth_providers import TokenPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """
+    Body and validators of a response that can be revalidated.
+    """
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: bytes
+    headers: dict[str, str]
+    encoding: Optional[str]
+
+
+class GithubAdapter(HTTPAdapter):
+    """
+    Adapter for the requests of PyGithub instances of the service.
+
+    With a cache, GET requests are revalidated with `If-None-Match` or
+    `If-Modified-Since` and the cached body is served when the server answers
+    with `304 Not Modified`, which does not count against the GitHub rate
+    limit. Responses are cached per URL and token in the given cache, which
+    can be `TTLCache` or any other (e.g. on-disk) store with the same `get`
+    and `set` methods.
+
+    With a scheduler, requests wait for the rate limit budget and requests
+    rejected because of the rate limit are sent again once allowed.
+
+    With a token pool, each request is sent with the token selected by the pool
+    and requests rejected because of the rate limit are sent again with
+    another token. The pool tracks the rate limit budget itself, so it cannot
+    be combined with a scheduler.
+    """
+
+    # headers describing the original encoded body, not the cached content
+    _dropped_headers = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+    def __init__(
+        self,
+        cache: Optional[TTLCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        rate_limit_retries: int = 3,
+        token_pool: Optional["TokenPool"] = None,
+        **kwargs,
+    ) -> None:
+        if scheduler and token_pool:
+            raise ValueError(
+                "Rate limit scheduler cannot be combined with a token pool",
+            )
+
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.rate_limit_retries = rate_limit_retries
+        self.token_pool = token_pool
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ) -> requests.Response:
+        kwargs = {
+            "timeout": timeout,
+            "verify": verify,
+            "cert": cert,
+            "proxies": proxies,
+        }
+        if not self.scheduler and not self.token_pool:
+            return self._send_conditional(request, stream=stream, **kwargs)
+
+        for _ in range(self.rate_limit_retries):
+            response, rate_limited = self._send_limited(
+                request,
+                stream=stream,
+                **kwargs,
+            )
+            if not rate_limited:
+                return response
+            response.close()
+
+        response, _ = self._send_limited(request, stream=stream, **kwargs)
+        return response
+
+    def _send_limited(
+        self,
+        request: requests.PreparedRequest,
+        stream=False,
+        **kwargs,
+    ) -> tuple[requests.Response, bool]:
+        token = None
+        if self.token_pool:
+            token = self.token_pool.select_request_token(request.method, request.url)
+            request.headers["Authorization"] = f"token {token}"
+
+        resource = None
+        if self.scheduler:
+            resource = self.scheduler.get_resource(request.url)
+            self.scheduler.acquire(resource)
+
+        response = self._send_conditional(request, stream=stream, **kwargs)
+
+        rate_limited = False
+        if resource:
+            rate_limited = self.scheduler.update(
+                resource,
+                response.status_code,
+                response.headers,
+            )
+        if token:
+            rate_limited = (
+                self.token_pool.update(token, response.status_code, response.headers)
+                or rate_limited
+            )
+        return response, rate_limited
+
+    @staticmethod
+    def _get_key(request: requests.PreparedRequest) -> tuple[str, str]:
+        authorization = request.headers.get("Authorization", "")
+        token = (
+            authorization.encode() if isinstance(authorization, str) else authorization
+        )
+        return request.url, hashlib.sha256(token).hexdigest()
+
+    def _send_conditional(
+        self,
+        request: requests.PreparedRequest,
+        stream=False,
+        **kwargs,
+    ) -> requests.Response:
+        if self.cache is None or request.method != "GET" or stream:
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self._get_key(request)
+        cached: Optional[CachedResponse] = self.cache.get(key)
+        if cached:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            else:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and cached:
+            response.close()
+            return self._from_cache(response, cached)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self.cache.set(
+                key,
+                CachedResponse(
+                    etag=etag,
+                    last_modified=last_modified,
+                    content=response.content,
+                    headers={
+                        header: value
+                        for header, value in response.headers.items()
+                        if header not in self._dropped_headers
+                    },
+                    encoding=response.encoding,
+                ),
+            )
+
+        return response
+
+    def _from_cache(
+        self,
+        not_modified: requests.Response,
+        cached: CachedResponse,
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = cached.content
+        response.encoding = cached.encoding
+        response.headers = CaseInsensitiveDict(cached.headers)
+        # keep the fresh rate limit headers and validators
+        response.headers.update(
+            {
+                header: value
+                for header, value in not_modified.headers.items()
+                if header not in self._dropped_headers
+            },
+        )
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.connection = self
+        response.elapsed = not_modified.elapsed
+        return response
+
+
+def mount_github_adapter(
+    pygithub_instance: github.Github,
+    adapter: GithubAdapter,
+) -> None:
+    """
+    Make the PyGithub instance send its requests through the adapter.
+
+    PyGithub does not allow passing a session or an adapter, the adapter is
+    mounted on the session of the requester's connection instead. The
+    connection is created right away and kept by the requester until it is
+    closed.
+
+    PyGithub keeps the request being sent on the connection, so a PyGithub
+    instance must not be shared between threads, the adapter (and its
+    connection pool) can be.
+
+    Args:
+        pygithub_instance: PyGithub instance, before it made any request.
+        adapter: Adapter to be used, it can be shared by multiple instances.
+
+    Raises:
+        OgrException, if the connection of the PyGithub requester cannot be
+            created, i.e. the installed PyGithub is not supported.
+    """
+    requester = pygithub_instance.requester
+    create_connection = getattr(requester, "_Requester__createConnection", None)
+    if create_connection is None:
+        raise OgrException(
+            "The installed version of PyGithub is not supported: "
+            "the connection of the requester cannot be created.",
+        )
+
+    session = getattr(create_connection(), "session", None)
+    if not isinstance(session, requests.Session):
+        logger.warning(
+            "Conditional requests, rate limit scheduling and token pools "
+            "are not supported for this PyGithub instance.",
+        )
+        return
+
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
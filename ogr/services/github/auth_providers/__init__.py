@@ -4,11 +4,14 @@
 from ogr.services.github.auth_providers.abstract import GithubAuthentication
 from ogr.services.github.auth_providers.github_app import GithubApp
 from ogr.services.github.auth_providers.token import TokenAuthentication
+from ogr.services.github.auth_providers.token_pool import TokenPool, TokenUsage
 from ogr.services.github.auth_providers.tokman import Tokman
 
 __all__ = [
     GithubAuthentication.__name__,
     TokenAuthentication.__name__,
+    TokenPool.__name__,
+    TokenUsage.__name__,
     GithubApp.__name__,
     Tokman.__name__,
 ]
@@ -1,6 +1,8 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import datetime
+from collections.abc import Hashable
 from typing import Optional
 
 import github
@@ -24,6 +26,28 @@ class GithubAuthentication:
         """
         raise NotImplementedError()
 
+    def get_token_expiration(self, token: str) -> Optional[datetime.datetime]:
+        """
+        Get expiration of a token previously returned by `get_token`.
+
+        Args:
+            token: Token to be checked.
+
+        Returns:
+            Time when the token expires or `None` if it is not known.
+        """
+        return None
+
+    @property
+    def identity_key(self) -> Hashable:
+        """
+        Returns:
+            Key identifying the credentials, e.g. for caching the login
+            of the authenticated user.
+        """
+        # kept alive by the cache, so it cannot be mistaken for another object
+        return self
+
     @property
     def pygithub_instance(self) -> "github.Github":
         """
@@ -1,6 +1,9 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import datetime
+import threading
+from collections.abc import Hashable
 from pathlib import Path
 from typing import Optional
 
@@ -11,6 +14,9 @@ from ogr.services.github.auth_providers.abstract import GithubAuthentication
 
 
 class GithubApp(GithubAuthentication):
+    # installation tokens are refreshed this long before they expire
+    TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
     def __init__(self, id: str, private_key: str, private_key_path: str) -> None:
         self.id = id
         self._private_key = private_key
@@ -18,6 +24,14 @@ class GithubApp(GithubAuthentication):
 
         self._github: github.Github = None
         self._integration: github.GithubIntegration = None
+        self._loaded_private_key: Optional[str] = None
+
+        self._lock = threading.Lock()
+        # (namespace, repo) → installation id and owner → installation id
+        self._repo_installations: dict[tuple[str, str], int] = {}
+        self._owner_installations: dict[str, int] = {}
+        # installation id → (token, expires_at)
+        self._tokens: dict[int, tuple[str, datetime.datetime]] = {}
 
     def __eq__(self, o: object) -> bool:
         if not issubclass(o.__class__, GithubApp):
@@ -49,6 +63,9 @@ class GithubApp(GithubAuthentication):
         if self._private_key:
             return self._private_key
 
+        if self._loaded_private_key:
+            return self._loaded_private_key
+
         if self._private_key_path:
             if not Path(self._private_key_path).is_file():
                 raise OgrException(
@@ -56,10 +73,15 @@ class GithubApp(GithubAuthentication):
                     f"({self._private_key_path}) "
                     f"does not exist.",
                 )
-            return Path(self._private_key_path).read_text()
+            self._loaded_private_key = Path(self._private_key_path).read_text()
+            return self._loaded_private_key
 
         return None
 
+    @property
+    def identity_key(self) -> Hashable:
+        return ("github_app", self.id)
+
     @property
     def pygithub_instance(self) -> Optional[github.Github]:
         # used for backward compatibility with GitUser
@@ -71,9 +93,20 @@ class GithubApp(GithubAuthentication):
             self._integration = github.GithubIntegration(self.id, self.private_key)
         return self._integration
 
-    def get_token(self, namespace: str, repo: str) -> str:
-        if not self.private_key:
-            return None
+    def _get_installation_id(self, namespace: str, repo: str) -> int:
+        """
+        Get ID of the app installation for the repository.
+
+        IDs are cached per repository and per owner, the app is installed
+        on the owner's account, so the other repositories of the same owner
+        do not need to be looked up again.
+        """
+        with self._lock:
+            inst_id = self._repo_installations.get(
+                (namespace, repo),
+            ) or self._owner_installations.get(namespace)
+        if inst_id:
+            return inst_id
 
         # PyGithub 1.58 deprecated get_installation() in favor of get_repo_installation()
         # that raises an exception on error rather than returning None
@@ -99,9 +132,40 @@ class GithubApp(GithubAuthentication):
                 f"No installation ID provided for {namespace}/{repo}: "
                 "please make sure that you provided correct credentials of your GitHub app.",
             )
+
+        with self._lock:
+            self._repo_installations[(namespace, repo)] = inst_id
+            self._owner_installations[namespace] = inst_id
+        return inst_id
+
+    def get_token(self, namespace: str, repo: str) -> str:
+        if not self.private_key:
+            return None
+
+        inst_id = self._get_installation_id(namespace, repo)
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        with self._lock:
+            cached = self._tokens.get(inst_id)
+        if cached and cached[1] - self.TOKEN_REFRESH_MARGIN > now:
+            return cached[0]
+
         inst_auth = self.integration.get_access_token(inst_id)  # type: ignore
+        expires_at = inst_auth.expires_at
+        if expires_at is not None:
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+            with self._lock:
+                self._tokens[inst_id] = (inst_auth.token, expires_at)
         return inst_auth.token
 
+    def get_token_expiration(self, token: str) -> Optional[datetime.datetime]:
+        with self._lock:
+            for cached_token, expires_at in self._tokens.values():
+                if cached_token == token:
+                    return expires_at
+        return None
+
     @staticmethod
     def try_create(
         github_app_id: Optional[str] = None,
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+from collections.abc import Hashable
 from typing import Optional, Union
 
 import github
@@ -25,6 +26,10 @@ class TokenAuthentication(GithubAuthentication):
         )
         return f"Token({censored_token})"
 
+    @property
+    def identity_key(self) -> Hashable:
+        return ("token", self._token)
+
     @property
     def pygithub_instance(self) -> github.Github:
         return self._pygithub_instance
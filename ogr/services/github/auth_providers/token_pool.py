@@ -0,0 +1,250 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import datetime
+import logging
+import math
+import re
+import threading
+import time
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass
+from typing import Optional, Union
+from urllib.parse import urlparse
+
+import github
+from urllib3.util import Retry
+
+from ogr.services.github.auth_providers.abstract import GithubAuthentication
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TokenUsage:
+    """
+    Consumption and rate limit budget of one token of the pool.
+    """
+
+    token: str
+    requests: int
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset: Optional[datetime.datetime] = None
+    quarantined_until: Optional[datetime.datetime] = None
+
+
+class TokenPool(GithubAuthentication):
+    """
+    Pool of tokens balanced by their remaining rate limit budget.
+
+    Every read of the service is sent with the token that has the most
+    requests left, as reported by the rate limit headers of the previous
+    responses. Tokens rejected because of the (secondary) rate limit are
+    quarantined until GitHub allows them again and the request is sent with
+    another token.
+
+    The rate limit is shared by all tokens of an account, so the tokens are
+    expected to belong to different accounts. To act as one identity, writes
+    and requests about the authenticated user are always sent with the first
+    token, i.e. the pool authenticates as the account of the first token.
+    """
+
+    # quarantine when GitHub signals the secondary rate limit without Retry-After
+    QUARANTINE = 60.0
+
+    def __init__(
+        self,
+        tokens: list[str],
+        max_retries: Union[int, Retry] = 0,
+        **_,
+    ) -> None:
+        if not tokens:
+            raise ValueError("At least one token is required")
+
+        self._tokens = list(tokens)
+        self._pygithub_instance = github.Github(
+            login_or_token=self._tokens[0],
+            retry=max_retries,
+        )
+
+        self._lock = threading.Lock()
+        # token → (limit, remaining, reset as a timestamp)
+        self._budgets: dict[str, tuple[int, int, float]] = {}
+        self._requests = dict.fromkeys(self._tokens, 0)
+        self._quarantined_until: dict[str, float] = {}
+
+    def __eq__(self, o: object) -> bool:
+        return issubclass(o.__class__, TokenPool) and (
+            self._tokens == o._tokens  # type: ignore
+        )
+
+    def __str__(self) -> str:
+        return f"TokenPool(tokens={len(self._tokens)})"
+
+    @staticmethod
+    def _censor(token: str) -> str:
+        return f"{token[:1]}***{token[-1:]}"
+
+    @property
+    def identity_key(self) -> Hashable:
+        # the identity is the account of the first token
+        return ("token", self._tokens[0])
+
+    @property
+    def pygithub_instance(self) -> github.Github:
+        return self._pygithub_instance
+
+    def get_token(self, namespace: str, repo: str) -> str:
+        return self.select_token()
+
+    def _get_remaining(self, token: str, now: float) -> float:
+        if token not in self._budgets:
+            # tokens that have not been used yet are preferred
+            return math.inf
+
+        limit, remaining, reset = self._budgets[token]
+        return limit if now >= reset else remaining
+
+    def select_token(self) -> str:
+        """
+        Returns:
+            Token with the most remaining requests that is not quarantined,
+            or the one released from the quarantine first if all of them are.
+        """
+        now = time.time()
+        with self._lock:
+            available = [
+                token
+                for token in self._tokens
+                if self._quarantined_until.get(token, 0.0) <= now
+            ]
+            if not available:
+                return min(self._tokens, key=self._quarantined_until.__getitem__)
+
+            return max(
+                available,
+                key=lambda token: (
+                    self._get_remaining(token, now),
+                    -self._requests[token],
+                ),
+            )
+
+    def select_request_token(self, method: str, url: str) -> str:
+        """
+        Args:
+            method: HTTP method of the request.
+            url: URL of the request.
+
+        Returns:
+            First token for writes and requests about the authenticated user,
+            token selected by `select_token` otherwise.
+        """
+        path = urlparse(url).path.removeprefix("/api/v3")
+        if method not in ("GET", "HEAD") or re.match("/user(/|$)", path):
+            return self._tokens[0]
+        return self.select_token()
+
+    def update(
+        self,
+        token: str,
+        status_code: int,
+        headers: Mapping[str, str],
+    ) -> bool:
+        """
+        Update the budget of the token from the response.
+
+        Args:
+            token: Token the request has been sent with.
+            status_code: Status code of the response.
+            headers: Headers of the response.
+
+        Returns:
+            `True` if the token has been quarantined because of the rate limit,
+            `False` otherwise.
+        """
+        if token not in self._requests:
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._requests[token] += 1
+            try:
+                budget = (
+                    int(headers["X-RateLimit-Limit"]),
+                    int(headers["X-RateLimit-Remaining"]),
+                    float(headers["X-RateLimit-Reset"]),
+                )
+            except (KeyError, ValueError):
+                budget = None
+            # budget of the `core` resource drives the balancing
+            if budget and headers.get("X-RateLimit-Resource", "core") == "core":
+                self._budgets[token] = budget
+
+            if status_code not in (403, 429):
+                return False
+
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                quarantined_until = now + int(retry_after)
+            elif budget and budget[1] == 0:
+                quarantined_until = budget[2]
+            elif status_code == 429:
+                quarantined_until = now + self.QUARANTINE
+            else:
+                # plain 403, e.g. missing permissions
+                return False
+
+            self._quarantined_until[token] = quarantined_until
+            logger.warning(
+                f"Token {self._censor(token)} hit the rate limit, "
+                f"quarantined for {quarantined_until - now:.0f}s",
+            )
+            return True
+
+    def get_usage(self) -> list[TokenUsage]:
+        """
+        Get the consumption of the tokens for monitoring.
+
+        Returns:
+            Usage of each token (censored) in the order of the pool.
+        """
+        now = time.time()
+        usage = []
+        with self._lock:
+            for token in self._tokens:
+                limit, remaining, reset = self._budgets.get(token, (None, None, None))
+                quarantined_until = self._quarantined_until.get(token, 0.0)
+                usage.append(
+                    TokenUsage(
+                        token=self._censor(token),
+                        requests=self._requests[token],
+                        limit=limit,
+                        remaining=remaining,
+                        reset=(
+                            datetime.datetime.fromtimestamp(
+                                reset,
+                                datetime.timezone.utc,
+                            )
+                            if reset is not None
+                            else None
+                        ),
+                        quarantined_until=(
+                            datetime.datetime.fromtimestamp(
+                                quarantined_until,
+                                datetime.timezone.utc,
+                            )
+                            if quarantined_until > now
+                            else None
+                        ),
+                    ),
+                )
+        return usage
+
+    @staticmethod
+    def try_create(
+        tokens: Optional[list[str]] = None,
+        max_retries: Union[int, Retry] = 0,
+        **_,
+    ) -> Optional["TokenPool"]:
+        return TokenPool(tokens, max_retries=max_retries) if tokens else None
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+from collections.abc import Hashable
 from typing import Optional
 
 import github
@@ -23,6 +24,10 @@ class Tokman(GithubAuthentication):
     def __str__(self) -> str:
         return f"Tokman(instance_url='{self._instance_url}')"
 
+    @property
+    def identity_key(self) -> Hashable:
+        return ("tokman", self._instance_url)
+
     @property
     def pygithub_instance(self) -> Optional[github.Github]:
         # used for backward compatibility with GitUser
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+import threading
+import time
 from enum import Enum
 from typing import Any, Optional, Union
 
@@ -16,6 +18,9 @@ from ogr.services import github as ogr_github
 
 GithubCheckRunOutput = dict[str, Union[str, list[dict[str, Union[str, int]]]]]
 
+# GitHub accepts at most 50 annotations per request
+ANNOTATIONS_PER_REQUEST = 50
+
 
 class GithubCheckRunStatus(Enum):
     """
@@ -89,6 +94,38 @@ def create_github_check_run_output(
     return output
 
 
+def split_github_check_run_output(
+    output: GithubCheckRunOutput,
+) -> list[GithubCheckRunOutput]:
+    """
+    Split the output into outputs with at most `ANNOTATIONS_PER_REQUEST`
+    annotations each.
+
+    Annotations sent with subsequent updates of the check run are added to the
+    already existing ones, so the outputs are meant to be sent in sequence.
+
+    Args:
+        output: Output of the check run.
+
+    Returns:
+        List of outputs, the first one contains all the other fields.
+    """
+    annotations = output.get("annotations")
+    if not annotations or len(annotations) <= ANNOTATIONS_PER_REQUEST:
+        return [output]
+
+    chunks = [
+        annotations[i : i + ANNOTATIONS_PER_REQUEST]
+        for i in range(0, len(annotations), ANNOTATIONS_PER_REQUEST)
+    ]
+    first = {**output, "annotations": chunks[0]}
+    # title and summary are required with every output
+    return [first] + [
+        {"title": output["title"], "summary": output["summary"], "annotations": chunk}
+        for chunk in chunks[1:]
+    ]
+
+
 class GithubCheckRun(OgrAbstractClass):
     def __init__(
         self,
@@ -179,7 +216,7 @@ class GithubCheckRun(OgrAbstractClass):
 
     @output.setter
     def output(self, output: GithubCheckRunOutput) -> None:
-        self.raw_check_run.edit(output=output)
+        self._edit(output=output)
 
     @property
     def app(self) -> GithubApp:
@@ -230,6 +267,35 @@ class GithubCheckRun(OgrAbstractClass):
             completed_at=value_or_NotSet(completed_at),
         )
 
+    def _edit(self, output: Optional[GithubCheckRunOutput] = None, **kwargs) -> None:
+        """
+        Edit the check run, annotations of the output are sent in batches.
+
+        Args:
+            output: Output of the check run.
+
+                Defaults to `None`, output is not changed.
+            **kwargs: Other fields to be changed, see `CheckRun.edit`.
+        """
+        outputs = split_github_check_run_output(output) if output else [None]
+        self.raw_check_run.edit(output=value_or_NotSet(outputs[0]), **kwargs)
+        for remaining in outputs[1:]:
+            self.raw_check_run.edit(output=remaining)
+
+    def coalesced_updates(self, interval: float = 10.0) -> "GithubCheckRunUpdater":
+        """
+        Get an updater that merges frequent updates of the check run.
+
+        Args:
+            interval: Minimal time between two updates in seconds.
+
+                Defaults to `10.0`.
+
+        Returns:
+            Updater of the check run.
+        """
+        return GithubCheckRunUpdater(self, interval=interval)
+
     @staticmethod
     def get_list(
         project: "ogr_github.GithubProject",
@@ -365,6 +431,7 @@ class GithubCheckRun(OgrAbstractClass):
                 "you need to provide conclusion.",
             )
 
+        outputs = split_github_check_run_output(output) if output else [None]
         created_check_run = project.github_repo.create_check_run(
             name=name,
             head_sha=commit_sha,
@@ -374,8 +441,197 @@ class GithubCheckRun(OgrAbstractClass):
             started_at=value_or_NotSet(started_at),
             conclusion=value_or_NotSet(conclusion.name if conclusion else None),
             completed_at=value_or_NotSet(completed_at),
-            output=value_or_NotSet(output),
+            output=value_or_NotSet(outputs[0]),
             actions=value_or_NotSet(actions),
         )
 
-        return GithubCheckRun(project, created_check_run)
+        check_run = GithubCheckRun(project, created_check_run)
+        for remaining in outputs[1:]:
+            check_run.raw_check_run.edit(output=remaining)
+        return check_run
+
+
+class GithubCheckRunUpdater:
+    """
+    Merges frequent updates of a check run (e.g. progress of a long-running
+    check) so that at most one update is sent per `interval`.
+
+    Updates are sent right away when `interval` has passed since the last
+    one, otherwise they are merged with the pending ones and sent once
+    the interval passes. The latest value of each field wins, annotations
+    are accumulated. Completing the check run sends the pending updates
+    immediately.
+
+    Updates that failed to be sent are kept pending. An error of an update
+    sent in the background is raised by the next `flush`.
+
+    Can be used as a context manager that flushes the pending updates on exit.
+    """
+
+    def __init__(self, check_run: GithubCheckRun, interval: float = 10.0) -> None:
+        """
+        Args:
+            check_run: Check run to be updated.
+            interval: Minimal time between two updates in seconds.
+
+                Defaults to `10.0`.
+        """
+        self.check_run = check_run
+        self.interval = interval
+
+        # guards the pending updates, not held while sending them
+        self._lock = threading.Lock()
+        # keeps the updates in order
+        self._send_lock = threading.Lock()
+        self._pending: dict[str, Any] = {}
+        self._annotations: list[dict[str, Union[str, int]]] = []
+        self._last_sent = -float("inf")
+        self._timer: Optional[threading.Timer] = None
+        self._error: Optional[Exception] = None
+
+    def __enter__(self) -> "GithubCheckRunUpdater":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.flush()
+
+    def update(
+        self,
+        status: Optional[GithubCheckRunStatus] = None,
+        conclusion: Optional[GithubCheckRunResult] = None,
+        completed_at: Optional[datetime.datetime] = None,
+        output: Optional[GithubCheckRunOutput] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        """
+        Update the check run.
+
+        Args:
+            status: Status of the check run.
+
+                Defaults to `None`, status is not changed.
+            conclusion: Conclusion of the check run, sends the update
+                immediately.
+
+                Defaults to `None`, conclusion is not changed.
+            completed_at: Timestamp of completion of the check run.
+
+                Defaults to `None`, timestamp is not changed.
+            output: Output of the check run. Annotations are added to the ones
+                from the previous updates, title and summary default to the
+                ones of the check run.
+
+                Defaults to `None`, output is not changed.
+            url: URL with details of the run.
+
+                Defaults to `None`, URL is not changed.
+
+        Raises:
+            OperationNotSupported, if given completed status or completion
+                timestamp and no conclusion, or if given output without title
+                or summary and the check run has none.
+        """
+        if (
+            status == GithubCheckRunStatus.completed or completed_at
+        ) and conclusion is None:
+            raise OperationNotSupported(
+                "When provided completed status or completed at,"
+                " you need to provide conclusion.",
+            )
+
+        with self._lock:
+            if output:
+                self._pending["output"] = self._merge_output(output)
+                annotations = output.get("annotations")
+                if isinstance(annotations, list):
+                    self._annotations.extend(annotations)
+            if status:
+                self._pending["status"] = status.name
+            if conclusion:
+                self._pending["conclusion"] = conclusion.name
+            if completed_at:
+                self._pending["completed_at"] = completed_at
+            if url:
+                self._pending["details_url"] = url
+
+            delay = self._last_sent + self.interval - time.monotonic()
+            send_now = conclusion or delay <= 0
+            if not send_now and self._timer is None:
+                self._timer = threading.Timer(delay, self._send_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if send_now:
+            self._send()
+
+    def flush(self) -> None:
+        """
+        Send the pending updates.
+
+        Raises:
+            Exception raised by sending the updates in the background, the
+                updates are kept pending.
+        """
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+        self._send()
+
+    def _merge_output(self, output: GithubCheckRunOutput) -> dict[str, Any]:
+        merged = {
+            **self._pending.get("output", {}),
+            **{key: value for key, value in output.items() if key != "annotations"},
+        }
+        # title and summary are required with every output
+        for field in ("title", "summary"):
+            if not merged.get(field):
+                merged[field] = getattr(self.check_run.output, field, None)
+            if not merged[field]:
+                raise OperationNotSupported(
+                    f"Output of the check run needs {field}.",
+                )
+        return merged
+
+    def _send_in_background(self) -> None:
+        try:
+            self._send()
+        except Exception as ex:
+            with self._lock:
+                self._error = ex
+
+    def _send(self) -> None:
+        with self._send_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending and not self._annotations:
+                    return
+
+                fields, self._pending = self._pending, {}
+                annotations, self._annotations = self._annotations, []
+
+            kwargs = dict(fields)
+            output = kwargs.pop("output", None)
+            if output is not None and annotations:
+                output = {**output, "annotations": annotations}
+
+            try:
+                self.check_run._edit(output=output, **kwargs)
+            except Exception:
+                with self._lock:
+                    # updates made in the meantime are newer
+                    restored = {**fields, **self._pending}
+                    if "output" in fields and "output" in self._pending:
+                        restored["output"] = {
+                            **fields["output"],
+                            **self._pending["output"],
+                        }
+                    self._pending = restored
+                    self._annotations = annotations + self._annotations
+                raise
+
+            with self._lock:
+                self._last_sent = time.monotonic()
@@ -5,6 +5,11 @@ import datetime
 from typing import ClassVar
 
 from github import UnknownObjectException
+from github.CommitCombinedStatus import (
+    CommitCombinedStatus as _GithubCommitCombinedStatus,
+)
+from github.CommitStatus import CommitStatus as _GithubCommitStatus
+from github.PaginatedList import PaginatedList
 
 from ogr.abstract import CommitFlag, CommitStatus
 from ogr.services import github as ogr_github
@@ -31,7 +36,14 @@ class GithubCommitFlag(BaseCommitFlag):
 
     @staticmethod
     def get(project: "ogr_github.GithubProject", commit: str) -> list["CommitFlag"]:
-        statuses = project.github_repo.get_commit(commit).get_statuses()
+        github_repo = project.github_repo
+        # listed directly, without fetching the commit first
+        statuses = PaginatedList(
+            _GithubCommitStatus,
+            github_repo.requester,
+            f"{github_repo.url}/statuses/{commit}",
+            None,
+        )
 
         try:
             return [
@@ -45,6 +57,44 @@ class GithubCommitFlag(BaseCommitFlag):
         except UnknownObjectException:
             return []
 
+    @staticmethod
+    def get_latest(
+        project: "ogr_github.GithubProject",
+        commit: str,
+    ) -> list["CommitFlag"]:
+        github_repo = project.github_repo
+        statuses: list[_GithubCommitStatus] = []
+        page = 1
+        while True:
+            try:
+                headers, data = github_repo.requester.requestJsonAndCheck(
+                    "GET",
+                    f"{github_repo.url}/commits/{commit}/status",
+                    parameters={"per_page": 100, "page": page},
+                )
+            except UnknownObjectException:
+                return []
+
+            # the statuses of the latest contexts are paginated
+            page_statuses = _GithubCommitCombinedStatus(
+                github_repo.requester,
+                headers,
+                data,
+            ).statuses
+            statuses.extend(page_statuses)
+            if not page_statuses or len(statuses) >= data["total_count"]:
+                break
+            page += 1
+
+        return [
+            GithubCommitFlag(
+                raw_commit_flag=raw_status,
+                project=project,
+                commit=commit,
+            )
+            for raw_status in statuses
+        ]
+
     @staticmethod
     def set(
         project: "ogr_github.GithubProject",
@@ -2,11 +2,13 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
-from typing import Optional, Union
+from collections.abc import Iterator
+from typing import Any, ClassVar, Optional, Union
 
 import github
 from github import UnknownObjectException
 from github.Issue import Issue as _GithubIssue
+from github.Label import Label as _GithubLabel
 
 from ogr.abstract import Issue, IssueComment, IssueLabel, IssueStatus
 from ogr.exceptions import (
@@ -19,9 +21,37 @@ from ogr.services.base import BaseIssue
 from ogr.services.github.comments import GithubIssueComment
 from ogr.services.github.label import GithubIssueLabel
 
+GRAPHQL_ISSUE_LIST_QUERY = """
+query($owner: String!, $name: String!, $states: [IssueState!],
+      $labels: [String!], $createdBy: String, $assignee: String,
+      $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(states: $states, first: $first, after: $after,
+           filterBy: {labels: $labels, createdBy: $createdBy, assignee: $assignee},
+           orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title body url state createdAt updatedAt
+        author { login }
+        assignees(first: 100) { nodes { login } }
+        labels(first: 100) { nodes { name color description } }
+      }
+    }
+  }
+}
+"""
+
 
 class GithubIssue(BaseIssue):
     raw_issue: _GithubIssue
+    # labels fetched together with the issue
+    _raw_labels: Optional[list[_GithubLabel]] = None
+
+    _graphql_states: ClassVar[dict[IssueStatus, Optional[list[str]]]] = {
+        IssueStatus.open: ["OPEN"],
+        IssueStatus.closed: ["CLOSED"],
+        IssueStatus.all: None,
+    }
 
     def __init__(
         self,
@@ -77,10 +107,12 @@ class GithubIssue(BaseIssue):
 
     @property
     def labels(self) -> list[IssueLabel]:
-        return [
-            GithubIssueLabel(raw_label, self)
-            for raw_label in self._raw_issue.get_labels()
-        ]
+        raw_labels = (
+            self._raw_labels
+            if self._raw_labels is not None
+            else self._raw_issue.get_labels()
+        )
+        return [GithubIssueLabel(raw_label, self) for raw_label in raw_labels]
 
     def __str__(self) -> str:
         return "Github" + super().__str__()
@@ -139,9 +171,7 @@ class GithubIssue(BaseIssue):
         if assignee:
             parameters["assignee"] = assignee
         if labels:
-            parameters["labels"] = [
-                project.github_repo.get_label(label) for label in labels
-            ]
+            parameters["labels"] = labels
 
         issues = project.github_repo.get_issues(**parameters)
         try:
@@ -153,6 +183,81 @@ class GithubIssue(BaseIssue):
         except UnknownObjectException:
             return []
 
+    @staticmethod
+    def iter_list(
+        project: "ogr_github.GithubProject",
+        status: IssueStatus = IssueStatus.open,
+        author: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[list[str]] = None,
+        page_size: int = 100,
+    ) -> Iterator["Issue"]:
+        if not project.has_issues:
+            raise IssueTrackerDisabled()
+
+        requester = project.github_repo.requester
+        variables: dict[str, Any] = {
+            "owner": project.namespace,
+            "name": project.repo,
+            "states": GithubIssue._graphql_states[status],
+            "labels": labels or None,
+            "createdBy": author,
+            "assignee": assignee,
+            "first": page_size,
+            "after": None,
+        }
+
+        while True:
+            _, data = requester.graphql_query(GRAPHQL_ISSUE_LIST_QUERY, variables)
+            issues = data["data"]["repository"]["issues"]
+            for node in issues["nodes"]:
+                # GraphQL matches issues with any of the labels, REST with all
+                # of them
+                names = {label["name"] for label in node["labels"]["nodes"]}
+                if labels and not names.issuperset(labels):
+                    continue
+                yield GithubIssue.__from_graphql(project, node)
+
+            if not issues["pageInfo"]["hasNextPage"]:
+                return
+            variables["after"] = issues["pageInfo"]["endCursor"]
+
+    @staticmethod
+    def __from_graphql(
+        project: "ogr_github.GithubProject",
+        node: dict[str, Any],
+    ) -> "GithubIssue":
+        github_repo = project.github_repo
+        requester = github_repo.requester
+        raw_issue = _GithubIssue(
+            requester,
+            {},
+            {
+                "number": node["number"],
+                "title": node["title"],
+                "body": node["body"],
+                "html_url": node["url"],
+                "url": f"{github_repo.url}/issues/{node['number']}",
+                "state": node["state"].lower(),
+                "created_at": node["createdAt"],
+                "updated_at": node["updatedAt"],
+                # author of deleted accounts is reported as `ghost` by REST API
+                "user": node["author"] or {"login": "ghost"},
+                "assignees": node["assignees"]["nodes"],
+                # GraphQL `issues` connection never contains pull requests
+                "pull_request": None,
+            },
+            # fields not selected by the query are fetched on access
+            completed=False,
+        )
+
+        issue = GithubIssue(raw_issue, project)
+        issue._raw_labels = [
+            _GithubLabel(requester, {}, label, completed=True)
+            for label in node["labels"]["nodes"]
+        ]
+        return issue
+
     def _get_all_comments(self) -> list[IssueComment]:
         return [
             GithubIssueComment(parent=self, raw_comment=raw_comment)
@@ -170,6 +275,7 @@ class GithubIssue(BaseIssue):
     def add_label(self, *labels: str) -> None:
         for label in labels:
             self._raw_issue.add_to_labels(label)
+        self._raw_labels = None
 
     def add_assignee(self, *assignees: str) -> None:
         try:
@@ -1,16 +1,23 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import copy
 import datetime
 import logging
+import time
+from collections import deque
+from collections.abc import Iterator
 from typing import ClassVar, Optional, Union
+from urllib.parse import quote
 
 import github
 from github import UnknownObjectException
 from github.Commit import Commit
 from github.CommitComment import CommitComment as _GithubCommitComment
 from github.GithubException import GithubException
+from github.GitRelease import GitRelease as PyGithubRelease
 from github.Repository import Repository
+from github.Tag import Tag as PyGithubTag
 
 from ogr.abstract import (
     AccessLevel,
@@ -24,7 +31,8 @@ from ogr.abstract import (
     PullRequest,
     Release,
 )
-from ogr.exceptions import GithubAPIException, OperationNotSupported
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
+from ogr.exceptions import GithubAPIException, OgrNetworkError, OperationNotSupported
 from ogr.read_only import GitProjectReadOnly, if_readonly
 from ogr.services import github as ogr_github
 from ogr.services.base import BaseGitProject
@@ -39,7 +47,7 @@ from ogr.services.github.flag import GithubCommitFlag
 from ogr.services.github.issue import GithubIssue
 from ogr.services.github.pull_request import GithubPullRequest
 from ogr.services.github.release import GithubRelease
-from ogr.utils import filter_paths, indirect
+from ogr.utils import filter_paths, indirect, iter_response_content
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +75,15 @@ class GithubProject(BaseGitProject):
         self.read_only = read_only
 
         self._github_instance = None
+        self._collaborators: Optional[dict[str, str]] = None
+        self._collaborators_expire_at = 0.0
+        # tag name → commit SHA, filled lazily by the lookups by name
+        self._tag_index: dict[str, str] = {}
+        self._tags_iterator: Optional[Iterator[PyGithubTag]] = None
+        # release name/tag → release, filled lazily by the lookups
+        self._release_index: dict[str, PyGithubRelease] = {}
+        self._release_tag_index: dict[str, PyGithubRelease] = {}
+        self._releases_iterator: Optional[Iterator[PyGithubRelease]] = None
 
     @property
     def github_instance(self):
@@ -81,8 +98,23 @@ class GithubProject(BaseGitProject):
     @property
     def github_repo(self):
         if not self._github_repo:
-            self._github_repo = self.github_instance.get_repo(
-                full_name_or_id=f"{self.namespace}/{self.repo}",
+            full_name = f"{self.namespace}/{self.repo}"
+
+            def fetch_repo_data() -> tuple[dict, dict]:
+                repo = self.github_instance.get_repo(full_name_or_id=full_name)
+                return repo.raw_data, repo.raw_headers
+
+            # concurrent projects with the same credentials share one request,
+            # only its data is shared, each project keeps its own PyGithub
+            # instance which must not be used by multiple threads
+            raw_data, raw_headers = self.service.single_flight.do(
+                ("repo", full_name, self.service._identity_key),
+                fetch_repo_data,
+            )
+            self._github_repo = self.github_instance.create_from_raw_data(
+                Repository,
+                copy.deepcopy(raw_data),
+                dict(raw_headers),
             )
 
             # Handle possible 301
@@ -90,7 +122,7 @@ class GithubProject(BaseGitProject):
                 self._github_repo.owner.login != self.namespace
                 or self._github_repo.name != self.repo
             ):
-                (self.namespace, self.repo) = (
+                self.namespace, self.repo = (
                     self._github_repo.owner.login,
                     self._github_repo.name,
                 )
@@ -200,6 +232,8 @@ class GithubProject(BaseGitProject):
         if invitation is None:
             raise GithubAPIException("User already added")
 
+        self._collaborators = None
+
     def request_access(self):
         raise OperationNotSupported("Not possible on GitHub")
 
@@ -241,24 +275,51 @@ class GithubProject(BaseGitProject):
         return self.__get_collaborators()
 
     def can_merge_pr(self, username) -> bool:
-        return (
-            self.github_repo.get_collaborator_permission(username)
-            in self.CAN_MERGE_PERMS
-        )
+        if not self.service.acl_cache_ttl:
+            # without caching one user is cheaper than listing all of them
+            permission = self.github_repo.get_collaborator_permission(username)
+        else:
+            permission = self._get_collaborators_with_permission().get(username)
+        return permission in self.CAN_MERGE_PERMS
+
+    @staticmethod
+    def __permission_from_listing(permissions) -> str:
+        """
+        Get the legacy permission level, as returned by the collaborator
+        permission endpoint, from the permissions in the collaborators listing.
+        """
+        if permissions is None:
+            return "none"
+        if permissions.admin:
+            return "admin"
+        if permissions.push:
+            return "write"
+        if permissions.pull or permissions.triage:
+            return "read"
+        return "none"
 
     def _get_collaborators_with_permission(self) -> dict:
         """
         Get all project collaborators in dictionary with permission association.
 
+        Permissions are taken from the collaborators listing and cached for
+        `acl_cache_ttl` seconds of the service.
+
         Returns:
             Dictionary with logins of collaborators and their permission level.
         """
-        collaborators = {}
-        users = self.github_repo.get_collaborators()
-        for user in users:
-            permission = self.github_repo.get_collaborator_permission(user)
-            collaborators[user.login] = permission
-        return collaborators
+        if (
+            self._collaborators is None
+            or time.monotonic() >= self._collaborators_expire_at
+        ):
+            self._collaborators = {
+                user.login: self.__permission_from_listing(user.permissions)
+                for user in self.github_repo.get_collaborators()
+            }
+            self._collaborators_expire_at = (
+                time.monotonic() + self.service.acl_cache_ttl
+            )
+        return self._collaborators
 
     @indirect(GithubIssue.get_list)
     def get_issue_list(
@@ -270,6 +331,42 @@ class GithubProject(BaseGitProject):
     ) -> list[Issue]:
         pass
 
+    @indirect(GithubIssue.iter_list)
+    def iter_issue_list(
+        self,
+        status: IssueStatus = IssueStatus.open,
+        author: Optional[str] = None,
+        assignee: Optional[str] = None,
+        labels: Optional[list[str]] = None,
+        page_size: int = 100,
+    ) -> Iterator[Issue]:
+        """
+        Iterate over issues, fetching the pages lazily using GraphQL queries.
+
+        Unlike `get_issue_list`, pull requests are never downloaded, and
+        the labels are fetched together with the issues.
+
+        Args:
+            status: Status of the issues.
+
+                Defaults to `IssueStatus.open`.
+            author: Username of the author of the issues.
+
+                Defaults to no filtering by author.
+            assignee: Username of the assignee of the issues.
+
+                Defaults to no filtering by assignee.
+            labels: Names of the labels the issues must have.
+
+                Defaults to no filtering by labels.
+            page_size: Number of issues fetched per query, at most 100.
+
+                Defaults to `100`.
+
+        Returns:
+            Iterator over the issues.
+        """
+
     @indirect(GithubIssue.get)
     def get_issue(self, issue_id: int) -> Issue:
         pass
@@ -292,17 +389,101 @@ class GithubProject(BaseGitProject):
     def get_pr_list(self, status: PRStatus = PRStatus.open) -> list[PullRequest]:
         pass
 
+    @indirect(GithubPullRequest.iter_list)
+    def iter_pr_list(self, status: PRStatus = PRStatus.open) -> Iterator[PullRequest]:
+        """
+        Iterate over pull requests, fetching the pages lazily.
+
+        Stopping the iteration early (e.g. after the first N merged pull
+        requests) avoids fetching the remaining pages.
+
+        Args:
+            status: Status of the pull requests.
+
+                Defaults to `PRStatus.open`.
+
+        Returns:
+            Iterator over the pull requests.
+        """
+
+    @indirect(GithubPullRequest.get_list_graphql)
+    def get_pr_list_graphql(
+        self,
+        status: PRStatus = PRStatus.open,
+        page_size: int = 100,
+    ) -> list[PullRequest]:
+        """
+        List pull requests using batched GraphQL queries.
+
+        Merged state, labels, mergeability and statuses of the head commit
+        are fetched together with the pull requests, so accessing `status`,
+        `labels`, `merge_commit_status` or calling `get_statuses()` on the
+        returned pull requests does not make any further requests.
+
+        Statuses are the latest ones per context, not the whole history.
+
+        Args:
+            status: Status of the pull requests.
+
+                Defaults to `PRStatus.open`.
+            page_size: Number of pull requests fetched per query, at most 100.
+
+                Defaults to `100`.
+
+        Returns:
+            List of pull requests.
+        """
+
     @indirect(GithubPullRequest.get)
     def get_pr(self, pr_id: int) -> PullRequest:
         pass
 
-    def get_sha_from_tag(self, tag_name: str) -> str:
-        # TODO: This is ugly. Can we do it better?
-        all_tags = self.github_repo.get_tags()
-        for tag in all_tags:
+    def _sha_from_tag_index(self, tag_name: str) -> Optional[str]:
+        """
+        Find the tag in the project's tag name → commit SHA index, extending
+        the index by fetching further pages of tags only until the tag
+        is found.
+
+        When the tag is not found, the index is dropped, so that tags created
+        in the meantime are listed by the next lookup. If the listing started
+        in an earlier lookup, the tags are listed again once right away.
+
+        Args:
+            tag_name: Name of the tag.
+
+        Returns:
+            SHA of the tagged commit or `None` if the tag does not exist.
+        """
+        if tag_name in self._tag_index:
+            return self._tag_index[tag_name]
+
+        relist = self._tags_iterator is not None
+        if self._tags_iterator is None:
+            self._tags_iterator = iter(self.github_repo.get_tags())
+
+        for tag in self._tags_iterator:
+            self._tag_index[tag.name] = tag.commit.sha
             if tag.name == tag_name:
                 return tag.commit.sha
-        raise GithubAPIException(f"Tag {tag_name} was not found.")
+
+        self.reset_tag_index()
+        if relist:
+            return self._sha_from_tag_index(tag_name)
+        return None
+
+    def reset_tag_index(self) -> None:
+        """
+        Drop the cached tag name → commit SHA index, e.g. after the tags
+        have been changed outside of ogr.
+        """
+        self._tag_index = {}
+        self._tags_iterator = None
+
+    def get_sha_from_tag(self, tag_name: str) -> str:
+        sha = self._sha_from_tag_index(tag_name)
+        if sha is None:
+            raise GithubAPIException(f"Tag {tag_name} was not found.")
+        return sha
 
     def get_tag_from_tag_name(self, tag_name: str) -> Optional[GitTag]:
         """
@@ -314,11 +495,8 @@ class GithubProject(BaseGitProject):
         Returns:
             GitTag associated with the given tag name or `None`.
         """
-        all_tags = self.github_repo.get_tags()
-        for tag in all_tags:
-            if tag.name == tag_name:
-                return GitTag(name=tag.name, commit_sha=tag.commit.sha)
-        return None
+        sha = self._sha_from_tag_index(tag_name)
+        return GitTag(name=tag_name, commit_sha=sha) if sha else None
 
     @if_readonly(return_function=GitProjectReadOnly.create_pr)
     @indirect(GithubPullRequest.create)
@@ -395,6 +573,13 @@ class GithubProject(BaseGitProject):
     def get_commit_statuses(self, commit: str) -> list[CommitFlag]:
         pass
 
+    @indirect(GithubCommitFlag.get_latest)
+    def get_latest_commit_statuses(self, commit: str) -> list[CommitFlag]:
+        """
+        Get the latest status of each context using the combined status
+        of the commit, i.e. with a single request.
+        """
+
     @indirect(GithubCheckRun.get)
     def get_check_run(
         self,
@@ -458,6 +643,35 @@ class GithubProject(BaseGitProject):
                 raise FileNotFoundError(f"File '{path}' on {ref} not found") from ex
             raise GithubAPIException() from ex
 
+    def iter_file_content(
+        self,
+        path: str,
+        ref: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        ref = ref or self.default_branch
+        url = f"{self.github_repo.url}/contents/{quote(path)}"
+        headers = {
+            "Accept": "application/vnd.github.raw",
+            **self.service.get_download_headers(url),
+        }
+
+        response = self.service.download_session.get(
+            url,
+            params={"ref": ref},
+            headers=headers,
+            stream=True,
+            timeout=self.service.download_timeout,
+        )
+        if not response.ok:
+            response.close()
+            if response.status_code == 404:
+                raise FileNotFoundError(f"File '{path}' on {ref} not found")
+            cls = OgrNetworkError if response.status_code >= 500 else GithubAPIException
+            raise cls(f"Couldn't get file '{path}' on {ref}: {response.reason}")
+
+        return iter_response_content(response, chunk_size)
+
     def get_files(
         self,
         ref: Optional[str] = None,
@@ -466,11 +680,11 @@ class GithubProject(BaseGitProject):
     ) -> list[str]:
         ref = ref or self.default_branch
         paths = []
-        contents = self.github_repo.get_contents(path="", ref=ref)
+        contents = deque(self.github_repo.get_contents(path="", ref=ref))
 
         if recursive:
             while contents:
-                file_content = contents.pop(0)
+                file_content = contents.popleft()
                 if file_content.type == "dir":
                     contents.extend(
                         self.github_repo.get_contents(path=file_content.path, ref=ref),
@@ -533,6 +747,15 @@ class GithubProject(BaseGitProject):
     def get_release(self, identifier=None, name=None, tag_name=None) -> GithubRelease:
         pass
 
+    def reset_release_index(self) -> None:
+        """
+        Drop the cached release name → release and tag → release indexes,
+        e.g. after the releases have been changed outside of ogr.
+        """
+        self._release_index = {}
+        self._release_tag_index = {}
+        self._releases_iterator = None
+
     @indirect(GithubRelease.get_latest)
     def get_latest_release(self) -> Optional[GithubRelease]:
         pass
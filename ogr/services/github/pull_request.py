@@ -3,31 +3,92 @@
 
 import datetime
 import logging
-from typing import Optional, Union
+from collections.abc import Iterator
+from typing import Any, ClassVar, Optional, Union
 
 import github
 import requests
 from github import UnknownObjectException
+from github.CommitStatus import CommitStatus as _GithubCommitStatus
 from github.IssueComment import IssueComment as _GithubIssueComment
+from github.Label import Label as _GithubLabel
 from github.PullRequest import PullRequest as _GithubPullRequest
 from github.PullRequestComment import PullRequestComment as _GithubPullRequestComment
 from github.Repository import Repository as _GithubRepository
 
-from ogr.abstract import MergeCommitStatus, PRComment, PRLabel, PRStatus, PullRequest
+from ogr.abstract import (
+    CommitFlag,
+    MergeCommitStatus,
+    PRComment,
+    PRLabel,
+    PRStatus,
+    PullRequest,
+)
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import GithubAPIException, OgrNetworkError
 from ogr.services import github as ogr_github
 from ogr.services.base import BasePullRequest
 from ogr.services.github.comments import GithubPRComment
+from ogr.services.github.flag import GithubCommitFlag
 from ogr.services.github.label import GithubPRLabel
+from ogr.utils import iter_response_content
 
 logger = logging.getLogger(__name__)
 
+GRAPHQL_PR_LIST_QUERY = """
+query($owner: String!, $name: String!, $states: [PullRequestState!],
+      $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: $states, first: $first, after: $after,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title body url state merged mergeable createdAt updatedAt
+        author { login }
+        mergeCommit { oid }
+        baseRefName baseRefOid headRefName headRefOid
+        headRepository { name nameWithOwner url owner { login } }
+        labels(first: 100) { nodes { name color description } }
+        commits(last: 1) {
+          nodes {
+            commit {
+              oid
+              status {
+                contexts { context state description targetUrl createdAt }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
 
 class GithubPullRequest(BasePullRequest):
     _raw_pr: _GithubPullRequest
     _target_project: "ogr_github.GithubProject"
     _source_project: "ogr_github.GithubProject" = None
 
+    # filled in when the pull request is loaded via GraphQL, so that the
+    # properties below do not need any further requests
+    _merged: Optional[bool] = None
+    _raw_labels: Optional[list[_GithubLabel]] = None
+    _statuses: Optional[list[CommitFlag]] = None
+
+    _graphql_states: ClassVar[dict[PRStatus, Optional[list[str]]]] = {
+        PRStatus.open: ["OPEN"],
+        PRStatus.closed: ["CLOSED", "MERGED"],
+        PRStatus.merged: ["MERGED"],
+        PRStatus.all: None,
+    }
+    _graphql_mergeable: ClassVar[dict[str, Optional[bool]]] = {
+        "MERGEABLE": True,
+        "CONFLICTING": False,
+        "UNKNOWN": None,
+    }
+
     @property
     def title(self) -> str:
         return self._raw_pr.title
@@ -42,11 +103,8 @@ class GithubPullRequest(BasePullRequest):
 
     @property
     def status(self) -> PRStatus:
-        return (
-            PRStatus.merged
-            if self._raw_pr.is_merged()
-            else PRStatus[self._raw_pr.state]
-        )
+        merged = self._merged if self._merged is not None else self._raw_pr.is_merged()
+        return PRStatus.merged if merged else PRStatus[self._raw_pr.state]
 
     @property
     def url(self) -> str:
@@ -78,25 +136,40 @@ class GithubPullRequest(BasePullRequest):
 
     @property
     def labels(self) -> list[PRLabel]:
-        return [
-            GithubPRLabel(raw_label, self) for raw_label in self._raw_pr.get_labels()
-        ]
+        raw_labels = (
+            self._raw_labels
+            if self._raw_labels is not None
+            else self._raw_pr.get_labels()
+        )
+        return [GithubPRLabel(raw_label, self) for raw_label in raw_labels]
 
     @property
     def diff_url(self) -> str:
         return f"{self._raw_pr.html_url}/files"
 
-    @property
-    def patch(self) -> bytes:
-        response = requests.get(self._raw_pr.patch_url)
+    def __get_patch(self, stream: bool = False) -> requests.Response:
+        service = self._target_project.service
+        url = self._raw_pr.patch_url
+        response = service.download_session.get(
+            url,
+            headers=service.get_download_headers(url),
+            stream=stream,
+            timeout=service.download_timeout,
+        )
 
         if not response.ok:
+            response.close()
             cls = OgrNetworkError if response.status_code >= 500 else GithubAPIException
-            raise cls(
-                f"Couldn't get patch from {self._raw_pr.patch_url} because {response.reason}.",
-            )
+            raise cls(f"Couldn't get patch from {url} because {response.reason}.")
 
-        return response.content
+        return response
+
+    @property
+    def patch(self) -> bytes:
+        return self.__get_patch().content
+
+    def iter_patch(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        return iter_response_content(self.__get_patch(stream=True), chunk_size)
 
     @property
     def commits_url(self) -> str:
@@ -193,6 +266,13 @@ class GithubPullRequest(BasePullRequest):
         project: "ogr_github.GithubProject",
         status: PRStatus = PRStatus.open,
     ) -> list["PullRequest"]:
+        return list(GithubPullRequest.iter_list(project, status))
+
+    @staticmethod
+    def iter_list(
+        project: "ogr_github.GithubProject",
+        status: PRStatus = PRStatus.open,
+    ) -> Iterator["PullRequest"]:
         prs = project.github_repo.get_pulls(
             # Github API has no status 'merged', just 'closed'/'opened'/'all'
             state=status.name if status != PRStatus.merged else "closed",
@@ -200,15 +280,149 @@ class GithubPullRequest(BasePullRequest):
             direction="desc",
         )
 
-        if status == PRStatus.merged:
-            prs = list(prs)  # Github PaginatedList into list()
-            for pr in prs:
-                if not pr.is_merged():  # parse merged PRs
-                    prs.remove(pr)
         try:
-            return [GithubPullRequest(pr, project) for pr in prs]
+            for raw_pr in prs:
+                # listing already tells whether the PR has been merged
+                merged = raw_pr.merged_at is not None
+                if status == PRStatus.merged and not merged:
+                    continue
+
+                pr = GithubPullRequest(raw_pr, project)
+                pr._merged = merged
+                yield pr
         except UnknownObjectException:
-            return []
+            return
+
+    @staticmethod
+    def get_list_graphql(
+        project: "ogr_github.GithubProject",
+        status: PRStatus = PRStatus.open,
+        page_size: int = 100,
+    ) -> list["PullRequest"]:
+        requester = project.github_repo.requester
+        variables: dict[str, Any] = {
+            "owner": project.namespace,
+            "name": project.repo,
+            "states": GithubPullRequest._graphql_states[status],
+            "first": page_size,
+            "after": None,
+        }
+
+        prs: list[PullRequest] = []
+        while True:
+            _, data = requester.graphql_query(GRAPHQL_PR_LIST_QUERY, variables)
+            pull_requests = data["data"]["repository"]["pullRequests"]
+            prs.extend(
+                GithubPullRequest.__from_graphql(project, node)
+                for node in pull_requests["nodes"]
+            )
+
+            if not pull_requests["pageInfo"]["hasNextPage"]:
+                return prs
+            variables["after"] = pull_requests["pageInfo"]["endCursor"]
+
+    @staticmethod
+    def __from_graphql(
+        project: "ogr_github.GithubProject",
+        node: dict[str, Any],
+    ) -> "GithubPullRequest":
+        github_repo = project.github_repo
+        requester = github_repo.requester
+        repos_url = github_repo.url.rsplit("/", 2)[0]
+
+        head_repo = None
+        if node["headRepository"]:
+            head_repo = {
+                "name": node["headRepository"]["name"],
+                "full_name": node["headRepository"]["nameWithOwner"],
+                "html_url": node["headRepository"]["url"],
+                "url": f"{repos_url}/{node['headRepository']['nameWithOwner']}",
+                "owner": node["headRepository"]["owner"],
+            }
+
+        raw_pr = _GithubPullRequest(
+            requester,
+            {},
+            {
+                "number": node["number"],
+                "title": node["title"],
+                "body": node["body"],
+                "html_url": node["url"],
+                "url": f"{github_repo.url}/pulls/{node['number']}",
+                "patch_url": f"{node['url']}.patch",
+                "state": "open" if node["state"] == "OPEN" else "closed",
+                "merged": node["merged"],
+                "mergeable": GithubPullRequest._graphql_mergeable.get(
+                    node["mergeable"],
+                ),
+                "merge_commit_sha": (node["mergeCommit"] or {}).get("oid"),
+                "created_at": node["createdAt"],
+                "updated_at": node["updatedAt"],
+                # author of deleted accounts is reported as `ghost` by REST API
+                "user": node["author"] or {"login": "ghost"},
+                "base": {"ref": node["baseRefName"], "sha": node["baseRefOid"]},
+                "head": {
+                    "ref": node["headRefName"],
+                    "sha": node["headRefOid"],
+                    "repo": head_repo,
+                },
+            },
+            # fields not selected by the query are fetched on access
+            completed=False,
+        )
+
+        pr = GithubPullRequest(raw_pr, project)
+        pr._merged = node["merged"]
+        pr._raw_labels = [
+            _GithubLabel(requester, {}, label, completed=True)
+            for label in node["labels"]["nodes"]
+        ]
+
+        commits = node["commits"]["nodes"]
+        pr._statuses = (
+            GithubPullRequest.__statuses_from_graphql(project, commits[-1]["commit"])
+            if commits
+            else []
+        )
+        return pr
+
+    @staticmethod
+    def __statuses_from_graphql(
+        project: "ogr_github.GithubProject",
+        commit: dict[str, Any],
+    ) -> list[CommitFlag]:
+        requester = project.github_repo.requester
+        contexts = (commit["status"] or {}).get("contexts", [])
+        return [
+            GithubCommitFlag(
+                raw_commit_flag=_GithubCommitStatus(
+                    requester,
+                    {},
+                    {
+                        # GraphQL reports required contexts without
+                        # any status yet as expected
+                        "state": (
+                            "pending"
+                            if context["state"] == "EXPECTED"
+                            else context["state"].lower()
+                        ),
+                        "context": context["context"],
+                        "description": context["description"],
+                        "target_url": context["targetUrl"],
+                        "created_at": context["createdAt"],
+                        "updated_at": context["createdAt"],
+                    },
+                ),
+                project=project,
+                commit=commit["oid"],
+            )
+            for context in contexts
+        ]
+
+    def get_statuses(self) -> list[CommitFlag]:
+        if self._statuses is not None:
+            return self._statuses
+        return super().get_statuses()
 
     def update_info(
         self,
@@ -252,11 +466,13 @@ class GithubPullRequest(BasePullRequest):
 
     def merge(self) -> "PullRequest":
         self._raw_pr.merge()
+        self._merged = None
         return self
 
     def add_label(self, *labels: str) -> None:
         for label in labels:
             self._raw_pr.add_to_labels(label)
+        self._raw_labels = None
 
     def get_comment(self, comment_id: int) -> PRComment:
         return GithubPRComment(self._raw_pr.get_issue_comment(comment_id))
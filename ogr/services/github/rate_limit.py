@@ -0,0 +1,244 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import datetime
+import logging
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitBudget:
+    """
+    Rate limit budget of one GitHub API resource (`core`, `search`, `graphql`…)
+    as last reported by GitHub.
+    """
+
+    resource: str
+    limit: int
+    remaining: int
+    reset: datetime.datetime
+    blocked_until: Optional[datetime.datetime] = None
+
+
+class RateLimitScheduler:
+    """
+    Paces requests sharing a token so that they stay under the GitHub rate
+    limit.
+
+    Budget is read from the rate limit headers of every response. Callers
+    are queued (instead of failing) when the budget is exhausted or GitHub
+    asked to back off (secondary rate limit), until the limit resets.
+    Background calls additionally keep `reserve` requests for interactive
+    ones, are spread evenly over the time left until the reset and wait
+    while any interactive call is queued.
+
+    Calls are interactive unless made within `background()`.
+
+    The scheduler is thread-safe and can be shared by multiple services
+    using the same token.
+    """
+
+    # back-off when GitHub signals the secondary rate limit without Retry-After
+    SECONDARY_RATE_LIMIT_DELAY = 60.0
+
+    def __init__(self, reserve: int = 100) -> None:
+        """
+        Args:
+            reserve: Number of requests that background calls leave
+                for the interactive ones.
+
+                Defaults to `100`.
+        """
+        self.reserve = reserve
+
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        # resource → (limit, remaining, reset as a timestamp)
+        self._budgets: dict[str, tuple[int, int, float]] = {}
+        self._blocked_until: dict[str, float] = {}
+        self._next_background_slot: dict[str, float] = {}
+        self._interactive_waiting = 0
+
+    @staticmethod
+    def get_resource(url: str) -> str:
+        """
+        Get the rate limit resource the request to the URL is counted in.
+        """
+        if "/graphql" in url:
+            return "graphql"
+        if "/search/" in url:
+            return "search"
+        return "core"
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """
+        Mark calls made by the current thread within the context as background
+        ones, so they give way to the interactive calls.
+        """
+        previous = getattr(self._local, "background", False)
+        self._local.background = True
+        try:
+            yield
+        finally:
+            self._local.background = previous
+
+    @property
+    def is_background(self) -> bool:
+        return getattr(self._local, "background", False)
+
+    def _get_delay(self, resource: str, background: bool, now: float) -> float:
+        delay = self._blocked_until.get(resource, 0.0) - now
+
+        if resource in self._budgets:
+            _, remaining, reset = self._budgets[resource]
+            if now < reset:
+                if remaining <= (self.reserve if background else 0):
+                    delay = max(delay, reset - now)
+                elif background:
+                    delay = max(
+                        delay,
+                        self._next_background_slot.get(resource, 0.0) - now,
+                    )
+
+        return delay
+
+    def acquire(self, resource: str = "core") -> None:
+        """
+        Wait until a request to the resource can be made.
+
+        Args:
+            resource: Rate limit resource of the request.
+
+                Defaults to `"core"`.
+        """
+        background = self.is_background
+        with self._condition:
+            if not background:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.time()
+                    delay = self._get_delay(resource, background, now)
+                    if background and self._interactive_waiting:
+                        # woken up once the interactive calls are done
+                        delay = max(delay, 1.0)
+                    if delay <= 0:
+                        break
+
+                    logger.debug(f"Waiting {delay:.1f}s for the {resource} rate limit")
+                    self._condition.wait(delay)
+
+                if resource in self._budgets:
+                    limit, remaining, reset = self._budgets[resource]
+                    self._budgets[resource] = (limit, remaining - 1, reset)
+                    if background and now < reset:
+                        spare = max(remaining - self.reserve, 1)
+                        self._next_background_slot[resource] = (
+                            now + (reset - now) / spare
+                        )
+            finally:
+                if not background:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()
+
+    def update(
+        self,
+        resource: str,
+        status_code: int,
+        headers: Mapping[str, str],
+    ) -> bool:
+        """
+        Update the budget from the response.
+
+        Args:
+            resource: Rate limit resource of the request.
+            status_code: Status code of the response.
+            headers: Headers of the response.
+
+        Returns:
+            `True` if the request has been rejected because of the rate limit,
+            `False` otherwise.
+        """
+        resource = headers.get("X-RateLimit-Resource", resource)
+        now = time.time()
+        rate_limited = False
+
+        with self._condition:
+            try:
+                budget = (
+                    int(headers["X-RateLimit-Limit"]),
+                    int(headers["X-RateLimit-Remaining"]),
+                    float(headers["X-RateLimit-Reset"]),
+                )
+            except (KeyError, ValueError):
+                budget = None
+            if budget:
+                self._budgets[resource] = budget
+
+            if status_code in (403, 429):
+                retry_after = headers.get("Retry-After")
+                if retry_after is not None and retry_after.isdigit():
+                    blocked_until = now + int(retry_after)
+                elif budget and budget[1] == 0:
+                    blocked_until = budget[2]
+                elif status_code == 429:
+                    blocked_until = now + self.SECONDARY_RATE_LIMIT_DELAY
+                else:
+                    # plain 403, e.g. missing permissions
+                    blocked_until = None
+
+                if blocked_until is not None:
+                    rate_limited = True
+                    self._blocked_until[resource] = max(
+                        self._blocked_until.get(resource, 0.0),
+                        blocked_until,
+                    )
+                    logger.warning(
+                        f"GitHub {resource} rate limit hit, "
+                        f"waiting {blocked_until - now:.0f}s",
+                    )
+
+            self._condition.notify_all()
+
+        return rate_limited
+
+    def get_budget(self, resource: str = "core") -> Optional[RateLimitBudget]:
+        """
+        Get the current budget of the resource for monitoring.
+
+        Args:
+            resource: Rate limit resource.
+
+                Defaults to `"core"`.
+
+        Returns:
+            The budget or `None` if no response for the resource has been seen.
+        """
+        with self._condition:
+            if resource not in self._budgets:
+                return None
+
+            limit, remaining, reset = self._budgets[resource]
+            blocked_until = self._blocked_until.get(resource)
+            return RateLimitBudget(
+                resource=resource,
+                limit=limit,
+                remaining=remaining,
+                reset=datetime.datetime.fromtimestamp(reset, datetime.timezone.utc),
+                blocked_until=(
+                    datetime.datetime.fromtimestamp(
+                        blocked_until,
+                        datetime.timezone.utc,
+                    )
+                    if blocked_until and blocked_until > time.time()
+                    else None
+                ),
+            )
@@ -10,32 +10,50 @@ from github.GitRelease import GitRelease as PyGithubRelease
 from ogr.abstract import GitTag, Release
 from ogr.exceptions import GithubAPIException
 from ogr.services import github as ogr_github
+from ogr.services.base import BaseRelease
 
 
-class GithubRelease(Release):
+class GithubRelease(BaseRelease):
     _raw_release: PyGithubRelease
     project: "ogr_github.GithubProject"
 
     @staticmethod
-    def _release_id_from_name(
+    def _release_from_index(
         project: "ogr_github.GithubProject",
-        name: str,
-    ) -> Optional[int]:
-        releases = project.github_repo.get_releases()
-        for release in releases:
-            if release.title == name:
-                return release.id
-        return None
-
-    @staticmethod
-    def _release_id_from_tag(
-        project: "ogr_github.GithubProject",
-        tag: str,
-    ) -> Optional[int]:
-        releases = project.github_repo.get_releases()
-        for release in releases:
-            if release.tag_name == tag:
-                return release.id
+        name: Optional[str] = None,
+        tag_name: Optional[str] = None,
+    ) -> Optional[PyGithubRelease]:
+        """
+        Find the release in the project's name → release or tag → release
+        index, extending both indexes by fetching further pages of releases
+        only until the release is found. The listing includes draft releases.
+
+        When the release is not found, the indexes are dropped, so that
+        releases created in the meantime are listed by the next lookup.
+        If the listing started in an earlier lookup, the releases are
+        listed again once right away.
+        """
+        if tag_name is not None and tag_name in project._release_tag_index:
+            return project._release_tag_index[tag_name]
+        if name is not None and name in project._release_index:
+            return project._release_index[name]
+
+        relist = project._releases_iterator is not None
+        if project._releases_iterator is None:
+            project._releases_iterator = iter(project.github_repo.get_releases())
+
+        for release in project._releases_iterator:
+            # releases are listed from the newest, keep the newest one
+            project._release_index.setdefault(release.title, release)
+            project._release_tag_index.setdefault(release.tag_name, release)
+            if (tag_name is not None and release.tag_name == tag_name) or (
+                name is not None and release.title == name
+            ):
+                return release
+
+        project.reset_release_index()
+        if relist:
+            return GithubRelease._release_from_index(project, name, tag_name)
         return None
 
     @property
@@ -77,12 +95,16 @@ class GithubRelease(Release):
         tag_name: Optional[str] = None,
     ) -> "Release":
         if tag_name:
-            identifier = GithubRelease._release_id_from_tag(project, tag_name)
+            release = GithubRelease._release_from_index(project, tag_name=tag_name)
         elif name:
-            identifier = GithubRelease._release_id_from_name(project, name)
-        if identifier is None:
+            release = GithubRelease._release_from_index(project, name=name)
+        elif identifier is not None:
+            release = project.github_repo.get_release(id=identifier)
+        else:
+            release = None
+
+        if release is None:
             raise GithubAPIException("Release was not found.")
-        release = project.github_repo.get_release(id=identifier)
         return GithubRelease(release, project)
 
     @staticmethod
@@ -113,6 +135,7 @@ class GithubRelease(Release):
             name=name,
             message=message,
         )
+        project.reset_release_index()
         return GithubRelease(created_release, project)
 
     def edit_release(self, name: str, message: str) -> None:
@@ -124,3 +147,4 @@ class GithubRelease(Release):
             message: New message for the release.
         """
         self._raw_release = self._raw_release.update_release(name=name, message=message)
+        self.project.reset_release_index()
@@ -1,12 +1,17 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import datetime
 import logging
+import math
 import re
+from collections.abc import Hashable
+from functools import cached_property
 from typing import Optional, Union
 
 import github
 import github.GithubObject
+import requests
 from github import (
     Github as PyGithubInstance,
 )
@@ -16,20 +21,25 @@ from github import (
 from github import (
     UnknownObjectException,
 )
+from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
 from ogr.abstract import AuthMethod, GitUser
-from ogr.exceptions import GithubAPIException
+from ogr.exceptions import GithubAPIException, OgrException
 from ogr.factory import use_for_service
 from ogr.services.base import BaseGitService, GitProject
+from ogr.services.github.adapter import GithubAdapter, mount_github_adapter
 from ogr.services.github.auth_providers import (
     GithubApp,
     GithubAuthentication,
     TokenAuthentication,
+    TokenPool,
     Tokman,
 )
 from ogr.services.github.project import GithubProject
+from ogr.services.github.rate_limit import RateLimitScheduler
 from ogr.services.github.user import GithubUser
+from ogr.utils import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +49,10 @@ class GithubService(BaseGitService):
     # class parameter could be used to mock Github class api
     github_class: type[github.Github]
     instance_url = "https://github.com"
+    _download_url_re = re.compile(
+        r"https?://(?:api\.github\.com/repos|github\.com)/"
+        r"(?P<namespace>[^/]+)/(?P<repo>[^/]+)/",
+    )
 
     def __init__(
         self,
@@ -49,17 +63,79 @@ class GithubService(BaseGitService):
         github_app_private_key_path: Optional[str] = None,
         tokman_instance_url: Optional[str] = None,
         github_authentication: GithubAuthentication = None,
+        tokens: Optional[list[str]] = None,
         max_retries: Union[int, Retry] = 1,
+        acl_cache_ttl: float = 0.0,
+        pygithub_pool_size: int = 32,
+        pygithub_pool_ttl: float = 3600.0,
+        conditional_requests: bool = False,
+        conditional_requests_cache: Optional[TTLCache] = None,
+        rate_limit_scheduler: Optional[RateLimitScheduler] = None,
+        download_pool_size: int = 10,
+        download_timeout: Optional[tuple[float, float]] = (10.0, 60.0),
         **kwargs,
     ):
         """
         If multiple authentication methods are provided, they are prioritised:
             1. Tokman
             2. GithubApp
-            3. TokenAuthentication (which is also default one, that works without specified token)
+            3. TokenPool
+            4. TokenAuthentication (which is also default one, that works without specified token)
+
+        With multiple `tokens`, each read is sent with the token of the pool
+        that has the most remaining rate limit budget, while writes and
+        requests about the authenticated user are sent with the first token
+        (see `TokenPool`). The pool replaces `rate_limit_scheduler`, which
+        tracks the budget of a single token, they cannot be combined.
+
+        Collaborators and their permissions are cached per project
+        for `acl_cache_ttl` seconds, permission checks may act on revoked
+        access until the cached listing expires. By default, the listing
+        is not cached and `can_merge_pr` asks for the permission of the single
+        user instead.
+
+        Projects authenticated with the same token share a connection pool,
+        each of them has its own PyGithub instance; at most `pygithub_pool_size`
+        pools are kept, each for `pygithub_pool_ttl` seconds or until its token
+        expires.
+
+        With `conditional_requests`, reads are revalidated with their ETag or
+        Last-Modified and served from `conditional_requests_cache` (an in-memory
+        cache of 1024 responses by default) when not modified, which does not
+        count against the rate limit.
+
+        With `rate_limit_scheduler`, requests are paced to stay within the rate
+        limit budget and queued instead of failing once it is exhausted;
+        the same scheduler should be shared by all services using one token.
+        Rate limited requests are then not retried blindly by `max_retries`.
+
+        Raw content (patches, archives, files) is downloaded through one
+        session with a pool of `download_pool_size` connections, authenticated
+        with the token of the project and limited by `download_timeout`
+        (connect and read timeout in seconds).
         """
+        if rate_limit_scheduler and (
+            tokens or isinstance(github_authentication, TokenPool)
+        ):
+            raise ValueError(
+                "Rate limit scheduler cannot be combined with a token pool",
+            )
+
         super().__init__()
         self.read_only = read_only
+        self.acl_cache_ttl = acl_cache_ttl
+        self._pygithub_adapters = TTLCache(
+            max_size=pygithub_pool_size,
+            ttl=pygithub_pool_ttl,
+        )
+        self._conditional_requests_cache = (
+            (conditional_requests_cache or TTLCache(max_size=1024, ttl=math.inf))
+            if conditional_requests
+            else None
+        )
+        self.rate_limit_scheduler = rate_limit_scheduler
+        self.download_pool_size = download_pool_size
+        self.download_timeout = download_timeout
         self._default_auth_method = github_authentication
         self._other_auth_method: GithubAuthentication = None
         self._auth_methods: dict[AuthMethod, GithubAuthentication] = {}
@@ -71,8 +147,15 @@ class GithubService(BaseGitService):
                 total=int(max_retries),
                 # Retry mechanism active for these HTTP methods:
                 allowed_methods=["DELETE", "GET", "PATCH", "POST", "PUT"],
-                # Only retry on following HTTP status codes
-                status_forcelist=[500, 503, 403, 401],
+                # Only retry on following HTTP status codes, rate limited
+                # requests are handled by the scheduler or the token pool
+                status_forcelist=(
+                    [500, 503, 401]
+                    if rate_limit_scheduler
+                    or tokens
+                    or isinstance(github_authentication, TokenPool)
+                    else [500, 503, 403, 401]
+                ),
                 raise_on_status=True,
             )
 
@@ -83,9 +166,14 @@ class GithubService(BaseGitService):
                 github_app_private_key=github_app_private_key,
                 github_app_private_key_path=github_app_private_key_path,
                 tokman_instance_url=tokman_instance_url,
+                tokens=tokens,
                 max_retries=self._max_retries,
             )
 
+        for authentication in (self._default_auth_method, *self._auth_methods.values()):
+            if authentication and authentication.pygithub_instance:
+                self.__mount_adapter(authentication.pygithub_instance, authentication)
+
         if kwargs:
             logger.warning(f"Ignored keyword arguments: {kwargs}")
 
@@ -93,6 +181,7 @@ class GithubService(BaseGitService):
         auth_methods = [
             (Tokman, AuthMethod.tokman),
             (GithubApp, AuthMethod.github_app),
+            (TokenPool, AuthMethod.token_pool),
             (TokenAuthentication, AuthMethod.token),
         ]
         for auth_class, auth_name in auth_methods:
@@ -124,6 +213,83 @@ class GithubService(BaseGitService):
     def github(self):
         return self.authentication.pygithub_instance
 
+    def __create_adapter(self, authentication: GithubAuthentication) -> GithubAdapter:
+        """
+        Create the adapter for the requested features.
+
+        Args:
+            authentication: Authentication the adapter is used with.
+
+        Returns:
+            Adapter with its own connection pool.
+        """
+        return GithubAdapter(
+            cache=self._conditional_requests_cache,
+            scheduler=self.rate_limit_scheduler,
+            token_pool=(
+                authentication if isinstance(authentication, TokenPool) else None
+            ),
+            max_retries=self._max_retries,
+        )
+
+    def __mount_adapter(
+        self,
+        instance: PyGithubInstance,
+        authentication: GithubAuthentication,
+    ) -> None:
+        """
+        Mount the adapter for the requested features on a newly created
+        PyGithub instance.
+
+        Args:
+            instance: PyGithub instance.
+            authentication: Authentication the instance was created by.
+        """
+        if not self.__requires_adapter(authentication):
+            return
+
+        mount_github_adapter(instance, self.__create_adapter(authentication))
+
+    def __requires_adapter(self, authentication: GithubAuthentication) -> bool:
+        """
+        Check whether any of the features provided by the adapter is requested.
+
+        Args:
+            authentication: Authentication the adapter would be used with.
+
+        Returns:
+            `True` if the requests cannot be sent without the adapter,
+            `False` otherwise.
+        """
+        return (
+            self._conditional_requests_cache is not None
+            or bool(self.rate_limit_scheduler)
+            or isinstance(authentication, TokenPool)
+        )
+
+    @cached_property
+    def download_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.download_pool_size,
+            pool_maxsize=self.download_pool_size,
+            max_retries=self._max_retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        match = self._download_url_re.match(url)
+        token = (
+            self.authentication.get_token(match["namespace"], match["repo"])
+            if match
+            else None
+        )
+        # credentials are not sent to other hosts on redirects (e.g. to the
+        # patch-diff.githubusercontent.com or codeload.github.com)
+        return {"Authorization": f"token {token}"} if token else {}
+
     def __str__(self) -> str:
         readonly_str = ", read_only=True" if self.read_only else ""
         arguments = f", github_authentication={self.authentication!s}{readonly_str}"
@@ -179,8 +345,17 @@ class GithubService(BaseGitService):
     def user(self) -> GitUser:
         return GithubUser(service=self)
 
+    @property
+    def _identity_key(self) -> Hashable:
+        return self.authentication.identity_key
+
     def change_token(self, new_token: str) -> None:
         self._default_auth_method = TokenAuthentication(new_token)
+        self.__mount_adapter(
+            self._default_auth_method.pygithub_instance,
+            self._default_auth_method,
+        )
+        self.invalidate_identity()
 
     def project_create(
         self,
@@ -212,7 +387,34 @@ class GithubService(BaseGitService):
 
     def get_pygithub_instance(self, namespace: str, repo: str) -> PyGithubInstance:
         token = self.authentication.get_token(namespace, repo)
-        return PyGithubInstance(login_or_token=token, retry=self._max_retries)
+
+        # PyGithub instances are not thread-safe, only the pool is shared
+        adapter = self._pygithub_adapters.get(token)
+        if adapter is None:
+            adapter = self.__create_adapter(self.authentication)
+
+            ttl = None
+            expires_at = self.authentication.get_token_expiration(token)
+            if expires_at is not None:
+                ttl = min(
+                    self._pygithub_adapters.ttl,
+                    (
+                        expires_at - datetime.datetime.now(datetime.timezone.utc)
+                    ).total_seconds(),
+                )
+            self._pygithub_adapters.set(token, adapter, ttl=ttl)
+
+        instance = PyGithubInstance(login_or_token=token, retry=self._max_retries)
+        try:
+            mount_github_adapter(instance, adapter)
+        except OgrException:
+            if self.__requires_adapter(self.authentication):
+                raise
+            # sharing the pool is only an optimization
+            logger.debug(
+                "Connection pool cannot be shared, using a plain PyGithub instance.",
+            )
+        return instance
 
     def list_projects(
         self,
@@ -23,7 +23,9 @@ class GithubUser(BaseGitUser):
         return self.service.github.get_user()
 
     def get_username(self) -> str:
-        return self.service.github.get_user().login
+        return self.service.get_cached_username(
+            lambda: self.service.github.get_user().login,
+        )
 
     def get_email(self) -> Optional[str]:
         user_email_property = self.service.github.get_user().email
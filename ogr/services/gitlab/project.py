@@ -3,6 +3,7 @@
 
 import logging
 import os
+from collections.abc import Iterator
 from typing import Any, Optional, Union
 
 import gitlab
@@ -22,6 +23,7 @@ from ogr.abstract import (
     PullRequest,
     Release,
 )
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import GitlabAPIException, OperationNotSupported
 from ogr.services import gitlab as ogr_gitlab
 from ogr.services.base import BaseGitProject
@@ -57,8 +59,11 @@ class GitlabProject(BaseGitProject):
     @property
     def gitlab_repo(self) -> GitlabObjectsProject:
         if not self._gitlab_repo:
-            self._gitlab_repo = self.service.gitlab_instance.projects.get(
-                f"{self.namespace}/{self.repo}",
+            full_name = f"{self.namespace}/{self.repo}"
+            # concurrent projects share one request
+            self._gitlab_repo = self.service.single_flight.do(
+                ("project", full_name, self.service.token),
+                lambda: self.service.gitlab_instance.projects.get(full_name),
             )
         return self._gitlab_repo
 
@@ -411,6 +416,27 @@ class GitlabProject(BaseGitProject):
                 raise FileNotFoundError(f"File '{path}' on {ref} not found") from ex
             raise GitlabAPIException() from ex
 
+    def iter_file_content(
+        self,
+        path: str,
+        ref: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        ref = ref or self.default_branch
+        # GitLab cannot resolve './'
+        path = os.path.normpath(path)
+        try:
+            return self.gitlab_repo.files.raw(
+                file_path=path,
+                ref=ref,
+                iterator=True,
+                chunk_size=chunk_size,
+            )
+        except gitlab.exceptions.GitlabGetError as ex:
+            if ex.response_code == 404:
+                raise FileNotFoundError(f"File '{path}' on {ref} not found") from ex
+            raise GitlabAPIException() from ex
+
     def get_files(
         self,
         ref: Optional[str] = None,
@@ -2,19 +2,21 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+from collections.abc import Iterator
 from typing import ClassVar, Optional
 
 import gitlab
-import requests
 from gitlab.exceptions import GitlabGetError
 from gitlab.v4.objects import MergeRequest as _GitlabMergeRequest
 
 from ogr.abstract import MergeCommitStatus, PRComment, PRLabel, PRStatus, PullRequest
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import GitlabAPIException, OgrNetworkError
 from ogr.services import gitlab as ogr_gitlab
 from ogr.services.base import BasePullRequest
 from ogr.services.gitlab.comments import GitlabPRComment
 from ogr.services.gitlab.label import GitlabPRLabel
+from ogr.utils import iter_response_content
 
 
 class GitlabPullRequest(BasePullRequest):
@@ -93,7 +95,13 @@ class GitlabPullRequest(BasePullRequest):
 
     @property
     def patch(self) -> bytes:
-        response = requests.get(f"{self.url}.patch")
+        service = self._target_project.service
+        url = f"{self.url}.patch"
+        response = service.download_session.get(
+            url,
+            headers=service.get_download_headers(url),
+            timeout=service.download_timeout,
+        )
 
         if not response.ok:
             cls = OgrNetworkError if response.status_code >= 500 else GitlabAPIException
@@ -103,6 +111,23 @@ class GitlabPullRequest(BasePullRequest):
 
         return response.content
 
+    def iter_patch(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        service = self._target_project.service
+        url = f"{self.url}.patch"
+        response = service.download_session.get(
+            url,
+            headers=service.get_download_headers(url),
+            stream=True,
+            timeout=service.download_timeout,
+        )
+
+        if not response.ok:
+            response.close()
+            cls = OgrNetworkError if response.status_code >= 500 else GitlabAPIException
+            raise cls(f"Couldn't get patch from {url} because {response.reason}.")
+
+        return iter_response_content(response, chunk_size)
+
     @property
     def head_commit(self) -> str:
         return self._raw_pr.sha
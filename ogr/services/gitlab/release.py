@@ -9,9 +9,10 @@ from gitlab.v4.objects import ProjectRelease as _GitlabRelease
 from ogr.abstract import GitTag, Release
 from ogr.exceptions import OperationNotSupported
 from ogr.services import gitlab as ogr_gitlab
+from ogr.services.base import BaseRelease
 
 
-class GitlabRelease(Release):
+class GitlabRelease(BaseRelease):
     _raw_release: _GitlabRelease
     project: "ogr_gitlab.GitlabProject"
 
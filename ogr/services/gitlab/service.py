@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from functools import cached_property
 from typing import Optional
 
 import gitlab
+import requests
 
 from ogr.abstract import GitUser
 from ogr.exceptions import GitlabAPIException, OperationNotSupported
@@ -59,6 +61,18 @@ class GitlabService(BaseGitService):
     def user(self) -> GitUser:
         return GitlabUser(service=self)
 
+    @cached_property
+    def download_session(self) -> requests.Session:
+        session = requests.Session()
+        session.verify = self.ssl_verify
+        return session
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        # the token is not sent to other hosts
+        if not self.token or not url.startswith(f"{self.instance_url.rstrip('/')}/"):
+            return {}
+        return {"PRIVATE-TOKEN": self.token}
+
     def __str__(self) -> str:
         token_str = (
             f", token='{self.token[:1]}***{self.token[-1:]}'" if self.token else ""
@@ -103,9 +117,14 @@ class GitlabService(BaseGitService):
             gitlab_repo=gitlab_repo,
         )
 
+    @property
+    def _identity_key(self) -> Optional[str]:
+        return self.token
+
     def change_token(self, new_token: str) -> None:
         self.token = new_token
         self._gitlab_instance = None
+        self.invalidate_identity()
 
     def project_create(
         self,
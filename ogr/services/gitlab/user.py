@@ -21,7 +21,7 @@ class GitlabUser(BaseGitUser):
         return self.service.gitlab_instance.user
 
     def get_username(self) -> str:
-        return self._gitlab_user.username
+        return self.service.get_cached_username(lambda: self._gitlab_user.username)
 
     def get_email(self) -> str:
         return self._gitlab_user.email
@@ -0,0 +1,85 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import time
+from collections.abc import Iterable
+
+from ogr.services import pagure as ogr_pagure
+
+
+class PagureAccessSnapshot:
+    """
+    Users and groups with access to a Pagure project, fetched at once.
+
+    Members of the groups are resolved on demand through the group member
+    cache of the service.
+
+    Attributes:
+        access_users (dict[str, list[str]]): Users per access level.
+        access_groups (dict[str, list[str]]): Groups per access level.
+    """
+
+    def __init__(
+        self,
+        service: "ogr_pagure.PagureService",
+        project_info: dict,
+        ttl: float = 0,
+    ) -> None:
+        self.service = service
+        self.access_users: dict[str, list[str]] = project_info["access_users"]
+        self.access_groups: dict[str, list[str]] = project_info["access_groups"]
+        self._expires_at = time.monotonic() + ttl
+
+    def __str__(self) -> str:
+        return (
+            f"PagureAccessSnapshot(access_users={self.access_users}, "
+            f"access_groups={self.access_groups})"
+        )
+
+    @property
+    def expired(self) -> bool:
+        return self._expires_at <= time.monotonic()
+
+    def get_users(self, access_levels: Iterable[str]) -> set[str]:
+        """
+        Get the user accounts with any of the given access levels, groups are
+        not considered.
+
+        Args:
+            access_levels: Pagure access levels, e.g. `["commit", "admin"]`.
+        """
+        return {
+            user
+            for access_level in access_levels
+            for user in self.access_users.get(access_level, [])
+        }
+
+    def get_groups(self, access_levels: Iterable[str]) -> set[str]:
+        """
+        Get the groups with any of the given access levels.
+
+        Args:
+            access_levels: Pagure access levels, e.g. `["commit", "admin"]`.
+        """
+        return {
+            group
+            for access_level in access_levels
+            for group in self.access_groups.get(access_level, [])
+        }
+
+    def get_users_with_access(self, access_levels: Iterable[str]) -> set[str]:
+        """
+        Get all users (considering groups) with any of the given access levels.
+
+        Args:
+            access_levels: Pagure access levels, e.g. `["commit", "admin"]`.
+        """
+        access_levels = set(access_levels)
+        users = self.get_users(access_levels)
+
+        # group cannot have owner access
+        groups = self.get_groups(access_levels - {"owner"})
+        for members in self.service.get_groups_members(groups).values():
+            users.update(members)
+
+        return users
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
-from typing import Any, Optional, Union, cast
+from typing import Optional, Union
 
 from ogr.abstract import Issue, IssueComment, IssueLabel, IssueStatus
 from ogr.exceptions import (
@@ -176,14 +176,11 @@ class PagureIssue(BaseIssue):
         if labels:
             payload["tags"] = labels
 
-        raw_issues: list[Any] = []
-
-        while True:
-            issues_info = project._call_project_api("issues", params=payload)
-            raw_issues += issues_info["issues"]
-            if not issues_info["pagination"]["next"]:
-                break
-            payload["page"] = cast(int, payload["page"]) + 1
+        raw_issues = project._call_project_api_paginated(
+            "issues",
+            key="issues",
+            params=payload,
+        )
 
         return [PagureIssue(issue_dict, project) for issue_dict in raw_issues]
 
@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from collections.abc import Iterable
+import re
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import closing
 from typing import ClassVar, Optional
 from urllib.parse import urlparse
 
@@ -18,6 +21,7 @@ from ogr.abstract import (
     PullRequest,
     Release,
 )
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import (
     OgrException,
     OperationNotSupported,
@@ -26,11 +30,17 @@ from ogr.exceptions import (
 from ogr.read_only import GitProjectReadOnly, if_readonly
 from ogr.services import pagure as ogr_pagure
 from ogr.services.base import BaseGitProject
+from ogr.services.pagure.acl import PagureAccessSnapshot
 from ogr.services.pagure.flag import PagureCommitFlag
 from ogr.services.pagure.issue import PagureIssue
 from ogr.services.pagure.pull_request import PagurePullRequest
 from ogr.services.pagure.release import PagureRelease
-from ogr.utils import RequestResponse, filter_paths, indirect
+from ogr.utils import (
+    RequestResponse,
+    filter_paths,
+    indirect,
+    iter_response_content,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +73,8 @@ class PagureProject(BaseGitProject):
         self.repo = repo
         self.namespace = namespace
 
+        self._access_snapshot: Optional[PagureAccessSnapshot] = None
+
     def __str__(self) -> str:
         fork_info = ""
         if self._is_fork:
@@ -168,6 +180,50 @@ class PagureProject(BaseGitProject):
             data=data,
         )
 
+    def _call_project_api_paginated(
+        self,
+        *args,
+        key: str,
+        params: Optional[dict] = None,
+    ) -> list:
+        """
+        Call paginated project API endpoint and collect items from all pages.
+
+        Once the first page reports the total number of pages, the remaining
+        pages are fetched concurrently, items are kept in the order of pages.
+
+        Args:
+            *args: String parts of the URL, e.g. `"a", "b"` will call `project/a/b`
+            key: Key of the list with items in the response.
+            params: HTTP(S) query parameters in form of a dictionary.
+
+        Returns:
+            List of items from all pages.
+        """
+        params = dict(params or {})
+        params.setdefault("page", 1)
+        response = self._call_project_api(*args, params=params)
+        items = list(response[key])
+
+        pages = response["pagination"].get("pages")
+        if not pages or self.service.max_workers == 1:
+            while response["pagination"]["next"]:
+                params["page"] += 1
+                response = self._call_project_api(*args, params=params)
+                items += response[key]
+            return items
+
+        def get_page(page: int) -> list:
+            return self._call_project_api(*args, params={**params, "page": page})[key]
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.service.max_workers, max(1, pages - 1)),
+        ) as executor:
+            for page_items in executor.map(get_page, range(2, pages + 1)):
+                items += page_items
+
+        return items
+
     def _get_project_url(self, *args, add_fork_part=True, add_api_endpoint_part=True):
         additional_parts = []
         if self._is_fork and add_fork_part:
@@ -208,42 +264,46 @@ class PagureProject(BaseGitProject):
         options = self._call_project_api("options", method="GET")
         return options["settings"]["issue_tracker"]
 
+    def get_access_snapshot(self, refresh: bool = False) -> PagureAccessSnapshot:
+        """
+        Get users and groups with access to the project. The snapshot is kept
+        for `acl_cache_ttl` seconds of the service.
+
+        Args:
+            refresh: Fetch the access lists even if the snapshot is still valid.
+
+                Defaults to `False`.
+
+        Returns:
+            Snapshot of the access lists.
+        """
+        snapshot = self._access_snapshot
+        if refresh or snapshot is None or snapshot.expired:
+            snapshot = PagureAccessSnapshot(
+                self.service,
+                self.get_project_info(),
+                ttl=self.service.acl_cache_ttl,
+            )
+            self._access_snapshot = snapshot
+        return snapshot
+
     def get_owners(self) -> list[str]:
-        project = self.get_project_info()
-        return project["access_users"]["owner"]
+        return list(self.get_access_snapshot().access_users["owner"])
 
     def who_can_close_issue(self) -> set[str]:
-        users: set[str] = set()
-        project = self.get_project_info()
-        users.update(project["access_users"]["admin"])
-        users.update(project["access_users"]["commit"])
-        users.update(project["access_users"]["ticket"])
-        users.update(project["access_users"]["owner"])
-        return users
+        return self.get_access_snapshot().get_users(
+            ["admin", "commit", "ticket", "owner"],
+        )
 
     def who_can_merge_pr(self) -> set[str]:
-        users: set[str] = set()
-        project = self.get_project_info()
-        users.update(project["access_users"]["admin"])
-        users.update(project["access_users"]["commit"])
-        users.update(project["access_users"]["owner"])
-        return users
+        return self.get_access_snapshot().get_users(["admin", "commit", "owner"])
 
     def which_groups_can_merge_pr(self) -> set[str]:
-        groups: set[str] = set()
-        project = self.get_project_info()
-        groups.update(project["access_groups"]["admin"])
-        groups.update(project["access_groups"]["commit"])
-        return groups
+        return self.get_access_snapshot().get_groups(["admin", "commit"])
 
     def can_merge_pr(self, username) -> bool:
-        accounts_that_can_merge_pr = self.who_can_merge_pr()
-
-        groups_that_can_merge_pr = self.which_groups_can_merge_pr()
-        accounts_that_can_merge_pr.update(
-            member
-            for group in groups_that_can_merge_pr
-            for member in self.service.get_group(group).members
+        accounts_that_can_merge_pr = self.get_access_snapshot().get_users_with_access(
+            ["admin", "commit", "owner"],
         )
 
         logger.info(
@@ -346,21 +406,17 @@ class PagureProject(BaseGitProject):
         if self.is_fork:
             raise OgrException("Cannot create fork from fork.")
 
-        for fork in self.get_forks():
-            fork_info = fork.get_project_info()
-            if self._user == fork_info["user"]["name"]:
-                return fork
+        fork = self._construct_fork_project()
+        if fork.exists():
+            return fork
 
-        if not self.is_forked():
-            if create:
-                return self.fork_create()
+        if create:
+            return self.fork_create()
 
-            logger.info(
-                f"Fork of {self.repo}"
-                " does not exist and we were asked not to create it.",
-            )
-            return None
-        return self._construct_fork_project()
+        logger.info(
+            f"Fork of {self.repo} does not exist and we were asked not to create it.",
+        )
+        return None
 
     def exists(self) -> bool:
         response = self._call_project_api_raw()
@@ -436,6 +492,8 @@ class PagureProject(BaseGitProject):
             },
         )
 
+        self._access_snapshot = None
+        self.service.invalidate_group_members()
         if response.status_code == 401:
             raise PagureAPIException(
                 "You are not allowed to modify ACL's",
@@ -463,6 +521,26 @@ class PagureProject(BaseGitProject):
             )
         return result.content.decode()
 
+    def iter_file_content(
+        self,
+        path: str,
+        ref: Optional[str] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        ref = ref or self.default_branch
+        response = self.service.get_raw_stream(
+            self._get_project_url("raw", ref, "f", path, add_api_endpoint_part=False),
+        )
+        if not response.ok:
+            response.close()
+            if response.status_code == 404:
+                raise FileNotFoundError(f"File '{path}' on {ref} not found")
+            raise PagureAPIException(
+                f"File '{path}' on {ref} not found due to {response.reason}",
+                response_code=response.status_code,
+            )
+        return iter_response_content(response, chunk_size)
+
     def get_sha_from_tag(self, tag_name: str) -> str:
         tags_dict = self.get_tags_dict()
         if tag_name not in tags_dict:
@@ -534,7 +612,16 @@ class PagureProject(BaseGitProject):
     ) -> Release:
         pass
 
-    def get_forks(self) -> list["PagureProject"]:
+    def get_forks(self, owner: Optional[str] = None) -> list["PagureProject"]:
+        """
+        Args:
+            owner: Return only the fork of the given user.
+
+                Defaults to `None`, which means forks of all users.
+
+        Returns:
+            Forks of the project.
+        """
         forks_url = self.service.get_api_url("projects")
         projects_response = self.service.call_api(
             url=forks_url,
@@ -549,6 +636,9 @@ class PagureProject(BaseGitProject):
                 is_fork=True,
             )
             for fork in projects_response["projects"]
+            if fork["name"] == self.repo
+            and fork["namespace"] == self.namespace
+            and (owner is None or fork["user"]["name"] == owner)
         ]
 
     def get_web_url(self) -> str:
@@ -560,27 +650,128 @@ class PagureProject(BaseGitProject):
         namespace = f"{self.namespace}/" if self.namespace else ""
         return f"{fork}{namespace}{self.repo}"
 
-    def __get_files(
-        self,
-        path: str,
-        ref: Optional[str] = None,
-        recursive: bool = False,
-    ) -> Iterable[str]:
-        subfolders = ["."]
+    def __get_folder(self, path: str, ref: Optional[str]) -> list[dict]:
+        split_path = []
+        if path != ".":
+            split_path = ["f", *path.split("/")]
+        return self._call_project_api("tree", ref, *split_path)["content"]
+
+    @staticmethod
+    def __walk_folders(
+        get_folder: Callable[[str], list[dict]],
+        recursive: bool,
+    ) -> Iterator[str]:
+        """
+        Walk the folders depth-first, the paths come in a stable order.
 
-        while subfolders:
-            path = subfolders.pop()
-            split_path = []
-            if path != ".":
-                split_path = ["f", *path.split("/")]
-            response = self._call_project_api("tree", ref, *split_path)
+        Args:
+            get_folder: Function returning the content of the folder.
+            recursive: Whether to walk the subfolders.
 
-            for file in response["content"]:
+        Returns:
+            Iterator over paths of the files.
+        """
+        subfolders = ["."]
+        while subfolders:
+            for file in get_folder(subfolders.pop()):
                 if file["type"] == "file":
                     yield file["path"]
                 elif recursive and file["type"] == "folder":
                     subfolders.append(file["path"])
 
+    def __fetch_folders(
+        self,
+        ref: Optional[str],
+    ) -> Generator[tuple[str, list[dict]], None, None]:
+        """
+        Fetch all folders of the tree concurrently, breadth-first, every
+        discovered folder is fetched by the pool.
+
+        Args:
+            ref: Branch or commit.
+
+        Returns:
+            Iterator over paths and contents of the folders in the order
+            they are fetched.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.service.max_workers)
+        try:
+            pending = {executor.submit(self.__get_folder, ".", ref): "."}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    content = future.result()
+                    yield pending.pop(future), content
+                    for file in content:
+                        if file["type"] == "folder":
+                            subfolder = executor.submit(
+                                self.__get_folder,
+                                file["path"],
+                                ref,
+                            )
+                            pending[subfolder] = file["path"]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __get_files(
+        self,
+        ref: Optional[str] = None,
+        recursive: bool = False,
+        ordered: bool = True,
+    ) -> Iterator[str]:
+        if not recursive or self.service.max_workers == 1:
+            yield from self.__walk_folders(
+                lambda path: self.__get_folder(path, ref),
+                recursive,
+            )
+            return
+
+        if ordered:
+            folders = dict(self.__fetch_folders(ref))
+            yield from self.__walk_folders(folders.__getitem__, recursive)
+            return
+
+        # closing the iterator cancels fetching of the remaining folders
+        with closing(self.__fetch_folders(ref)) as fetched_folders:
+            for _, content in fetched_folders:
+                yield from (file["path"] for file in content if file["type"] == "file")
+
+    def iter_files(
+        self,
+        ref: Optional[str] = None,
+        filter_regex: Optional[str] = None,
+        recursive: bool = False,
+    ) -> Iterator[str]:
+        """
+        Iterate over file paths of the repo as they are fetched.
+
+        Folders of the recursive walk are fetched concurrently, therefore
+        the order of the paths is not stable. Closing the iterator cancels
+        fetching of the remaining folders.
+
+        Args:
+            ref: Branch or commit.
+
+                Defaults to repo's default branch.
+            filter_regex: Filter the paths with `re.search`.
+
+                Defaults to `None`, which means no filtering.
+            recursive: Whether to return only top directory files
+                or all files recursively.
+
+                Defaults to `False`, which means only top-level directory.
+
+        Returns:
+            Iterator over paths of the files in the repo.
+        """
+        ref = ref or self.default_branch
+        paths = self.__get_files(ref, recursive, ordered=False)
+        if not filter_regex:
+            return paths
+
+        pattern = re.compile(filter_regex)
+        return (path for path in paths if pattern.search(path))
+
     def get_files(
         self,
         ref: Optional[str] = None,
@@ -588,7 +779,8 @@ class PagureProject(BaseGitProject):
         recursive: bool = False,
     ) -> list[str]:
         ref = ref or self.default_branch
-        paths = list(self.__get_files(".", ref, recursive))
+        # folders are fetched concurrently, but walked in a stable order
+        paths = list(self.__get_files(ref, recursive))
         if filter_regex:
             paths = filter_paths(paths, filter_regex)
 
@@ -627,18 +819,7 @@ class PagureProject(BaseGitProject):
         Arguments:
             access_levels: list of access levels, e.g. ['commit', 'admin']
         """
-        users = self._get_user_accounts_with_access(access_levels)
-
-        # group cannot have owner access
-        group_accounts = self._get_group_accounts_with_access(
-            list(set(access_levels) - {"owner"}),
-        )
-
-        users.update(
-            member
-            for group in group_accounts
-            for member in self.service.get_group(group).members
-        )
+        users = self.get_access_snapshot().get_users_with_access(access_levels)
 
         logger.info(
             f"All users (considering groups) with given access levels: {users}",
@@ -661,12 +842,10 @@ class PagureProject(BaseGitProject):
             raise OgrException(
                 f"Unsupported entity type {entity_type}: only 'users' and 'groups' are allowed.",
             )
-        entity_info = self.get_project_info()["access_" + entity_type]
-        result = set()
-        for access_level in access_levels:
-            result.update(entity_info[access_level])
-
-        return result
+        snapshot = self.get_access_snapshot()
+        if entity_type == "users":
+            return snapshot.get_users(access_levels)
+        return snapshot.get_groups(access_levels)
 
     def _get_user_accounts_with_access(self, access_levels: list[str]) -> set[str]:
         """
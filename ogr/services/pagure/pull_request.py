@@ -3,6 +3,7 @@
 
 import datetime
 import logging
+from collections.abc import Iterator
 from time import sleep
 from typing import Any, Optional, Union
 
@@ -14,11 +15,13 @@ from ogr.abstract import (
     PRStatus,
     PullRequest,
 )
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import PagureAPIException
 from ogr.services import pagure as ogr_pagure
 from ogr.services.base import BasePullRequest
 from ogr.services.pagure.comments import PagurePRComment
 from ogr.services.pagure.label import PagurePRLabel
+from ogr.utils import iter_response_content
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +115,22 @@ class PagurePullRequest(BasePullRequest):
             )
         return request_response.content
 
+    def iter_patch(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        response = self._target_project.service.get_raw_stream(
+            self._target_project._get_project_url(
+                "pull-request",
+                f"{self.id}.patch",
+                add_api_endpoint_part=False,
+            ),
+        )
+        if response.status_code != 200:
+            response.close()
+            raise PagureAPIException(
+                f"Cannot get patch from {self.url}.patch because {response.reason}.",
+                response_code=response.status_code,
+            )
+        return iter_response_content(response, chunk_size)
+
     @property
     def head_commit(self) -> str:
         return self._raw_pr["commit_stop"]
@@ -261,15 +280,11 @@ class PagurePullRequest(BasePullRequest):
         if author is not None:
             payload["author"] = author
 
-        raw_prs = []
-        while True:
-            page_result = project._call_project_api("pull-requests", params=payload)
-            raw_prs += page_result["requests"]
-            if not page_result["pagination"]["next"]:
-                break
-
-            # mypy don't know that key "page" really contains int...
-            payload["page"] += 1  # type: ignore
+        raw_prs = project._call_project_api_paginated(
+            "pull-requests",
+            key="requests",
+            params=payload,
+        )
 
         return [PagurePullRequest(pr_dict, project) for pr_dict in raw_prs]
 
@@ -5,11 +5,13 @@ import datetime
 from typing import Optional
 
 from ogr.abstract import GitTag, Release
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
 from ogr.exceptions import OperationNotSupported, PagureAPIException
 from ogr.services import pagure as ogr_pagure
+from ogr.services.base import BaseRelease
 
 
-class PagureRelease(Release):
+class PagureRelease(BaseRelease):
     _raw_release: GitTag
     project: "ogr_pagure.PagureProject"
 
@@ -86,3 +88,12 @@ class PagureRelease(Release):
 
     def edit_release(self, name: str, message: str) -> None:
         raise OperationNotSupported("edit_release not supported on Pagure")
+
+    def save_archive(
+        self,
+        filename: str,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        checksum: Optional[str] = None,
+        resume: bool = False,
+    ) -> None:
+        raise OperationNotSupported("Pagure API does not provide release archives")
@@ -2,7 +2,10 @@
 # SPDX-License-Identifier: MIT
 
 import logging
-from typing import Optional, Union
+import re
+from collections.abc import Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 
 import requests
 import urllib3
@@ -20,10 +23,13 @@ from ogr.services.base import BaseGitService, GitProject
 from ogr.services.pagure.group import PagureGroup
 from ogr.services.pagure.project import PagureProject
 from ogr.services.pagure.user import PagureUser
-from ogr.utils import RequestResponse
+from ogr.utils import RequestResponse, TTLCache
 
 logger = logging.getLogger(__name__)
 
+# project prefix, URL, params, data and token of a cached GET request
+CacheKey = tuple[str, str, Hashable, Hashable, Optional[str]]
+
 
 @use_for_service("pagure")
 @use_for_service("src.fedoraproject.org")
@@ -33,6 +39,30 @@ logger = logging.getLogger(__name__)
 @use_for_service("git.centos.org")
 @use_for_service("git.stg.centos.org")
 class PagureService(BaseGitService):
+    """
+    One instance of the service can be shared by multiple threads. All requests
+    go through one `requests.Session` with a bounded connection pool that keeps
+    the connections alive, the response and ACL caches are guarded by locks.
+    Changing the token is not synchronized with the requests in flight.
+    """
+
+    # parts of the project URL that follow the `<namespace>/<repo>` prefix
+    _project_subresources = frozenset(
+        (
+            "c",
+            "delete",
+            "git",
+            "issue",
+            "issues",
+            "new_issue",
+            "options",
+            "pull-request",
+            "pull-requests",
+            "raw",
+            "tree",
+        ),
+    )
+
     def __init__(
         self,
         token: Optional[str] = None,
@@ -40,25 +70,77 @@ class PagureService(BaseGitService):
         read_only: bool = False,
         insecure: bool = False,
         max_retries: Union[int, urllib3.util.Retry] = 5,
+        cache_size: int = 0,
+        cache_ttl: float = 60.0,
+        cache_endpoint_ttl: Optional[dict[str, float]] = None,
+        max_workers: int = 4,
+        acl_cache_ttl: float = 0.0,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: Optional[Union[float, tuple[float, float]]] = None,
         **kwargs,
     ) -> None:
+        """
+        Args:
+            cache_size: Maximum number of cached responses to GET requests.
+
+                Defaults to `0`, which means the responses are not cached.
+            cache_ttl: Default time to live of a cached response in seconds.
+            cache_endpoint_ttl: Time to live of cached responses for specific
+                endpoints, the keys are regular expressions searched for
+                in the URL, first match wins. TTL `0` disables caching
+                of the matching endpoints.
+            max_workers: Maximum number of concurrent requests used when fetching
+                multiple pages or resources at once. `1` disables concurrency.
+            acl_cache_ttl: Time to live in seconds of the cached group members
+                and access lists of the projects. Permission checks may act
+                on revoked access until the cached lists expire.
+
+                Defaults to `0`, which means the lists are not cached.
+            pool_connections: Number of connection pools to cache.
+            pool_maxsize: Maximum number of kept-alive connections per host,
+                should be at least the number of threads sharing the service.
+            pool_block: Wait for a free connection when the pool is exhausted
+                instead of opening a connection that is not kept alive.
+            timeout: Default timeout of the requests in seconds, either one
+                number or a `(connect, read)` tuple.
+
+                Defaults to `None`, which means waiting for the response forever.
+        """
         super().__init__()
         self.instance_url = instance_url
         self._token = token
         self.read_only = read_only
+        self.max_workers = max(1, max_workers)
+        self.acl_cache_ttl = acl_cache_ttl
+        self._group_members = TTLCache(max_size=256, ttl=acl_cache_ttl)
+
+        self.timeout = timeout
 
         self.session = requests.session()
 
-        adapter = requests.adapters.HTTPAdapter(max_retries=max_retries)
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
         self.insecure = insecure
-        if self.insecure:
-            self.session.mount("http://", adapter)
-        else:
-            self.session.mount("https://", adapter)
 
         self.header = {"Authorization": "token " + self._token} if self._token else {}
 
+        self._response_cache = (
+            TTLCache(max_size=cache_size, ttl=cache_ttl) if cache_size > 0 else None
+        )
+        self._cache_endpoint_ttl = [
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (cache_endpoint_ttl or {}).items()
+        ]
+
         if kwargs:
             logger.warning(f"Ignored keyword arguments: {kwargs}")
 
@@ -126,6 +208,7 @@ class PagureService(BaseGitService):
         method: Optional[str] = None,
         params: Optional[dict] = None,
         data=None,
+        timeout: Optional[Union[float, tuple[float, float]]] = None,
     ) -> dict:
         """
         Call API endpoint.
@@ -135,6 +218,8 @@ class PagureService(BaseGitService):
             method: Method of the HTTP request, e.g. `"GET"`, `"POST"`, etc.
             params: HTTP(S) query parameters in form of a dictionary.
             data: Data to be sent in form of a dictionary.
+            timeout: Timeout of this request, overrides the default timeout
+                of the service.
 
         Returns:
             Dictionary representing response.
@@ -142,7 +227,13 @@ class PagureService(BaseGitService):
         Raises:
             PagureAPIException, if error occurs.
         """
-        response = self.call_api_raw(url=url, method=method, params=params, data=data)
+        response = self.call_api_raw(
+            url=url,
+            method=method,
+            params=params,
+            data=data,
+            timeout=timeout,
+        )
 
         if response.status_code == 404:
             error_msg = (
@@ -190,6 +281,7 @@ class PagureService(BaseGitService):
         method: Optional[str] = None,
         params: Optional[dict] = None,
         data=None,
+        timeout: Optional[Union[float, tuple[float, float]]] = None,
     ):
         """
         Call API endpoint and returns raw response.
@@ -199,6 +291,8 @@ class PagureService(BaseGitService):
             method: Method of the HTTP request, e.g. `"GET"`, `"POST"`, etc.
             params: HTTP(S) query parameters in form of a dictionary.
             data: Data to be sent in form of a dictionary.
+            timeout: Timeout of this request, overrides the default timeout
+                of the service.
 
         Returns:
             `RequestResponse` object that represents the response from the API
@@ -206,17 +300,46 @@ class PagureService(BaseGitService):
         """
 
         method = method or "GET"
+
+        if method != "GET":
+            self.invalidate_cache(url, data=data)
+            return self.__call_api_raw(url, method, params, data, timeout)
+
+        cache_key = self._get_cache_key(url, params, data)
+        if self._response_cache is not None:
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.debug(f"Using cached response for '{url}'.")
+                return cached_response.copy()
+
+        # concurrent identical requests share one response
+        response = self.single_flight.do(
+            cache_key,
+            lambda: self.__call_api_raw(url, method, params, data, timeout),
+        )
+
+        if self._response_cache is not None and response.ok:
+            self._response_cache.set(cache_key, response, ttl=self._get_cache_ttl(url))
+
+        # the response is shared with the cache and the concurrent callers
+        return response.copy()
+
+    def __call_api_raw(self, url, method, params, data, timeout) -> RequestResponse:
         try:
             response = self.get_raw_request(
                 method=method,
                 url=url,
                 params=params,
                 data=data,
+                timeout=timeout,
             )
 
         except requests.exceptions.ConnectionError as er:
             logger.error(er)
             raise OgrNetworkError(f"Cannot connect to url: '{url}'.") from er
+        except requests.exceptions.Timeout as er:
+            logger.error(er)
+            raise OgrNetworkError(f"Request to url '{url}' timed out.") from er
 
         if response.status_code >= 500:
             raise GitForgeInternalError(
@@ -226,6 +349,97 @@ class PagureService(BaseGitService):
 
         return response
 
+    def _get_project_prefix(self, url: str) -> str:
+        """
+        Get the part of the URL that identifies the project, e.g. `rpms/python-ogr`
+        or `fork/user/rpms/python-ogr`.
+        """
+        for base in (self.api_url, f"{self.instance_url}/"):
+            if url.startswith(base):
+                url = url[len(base) :]
+                break
+
+        parts = [part for part in url.split("?")[0].split("/") if part]
+        prefix = []
+        if parts[:1] == ["fork"]:
+            prefix, parts = parts[:2], parts[2:]
+
+        for part in parts[:2]:
+            if part in self._project_subresources:
+                break
+            prefix.append(part)
+
+        return "/".join(prefix)
+
+    def _get_cache_key(self, url: str, params: Optional[dict], data) -> CacheKey:
+        def freeze(value: Any) -> Any:
+            if isinstance(value, dict):
+                return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+            if isinstance(value, (list, tuple, set)):
+                return tuple(freeze(v) for v in value)
+            return value
+
+        return (
+            self._get_project_prefix(url),
+            url,
+            freeze(params),
+            freeze(data),
+            self._token,
+        )
+
+    def _get_cache_ttl(self, url: str) -> Optional[float]:
+        for pattern, ttl in self._cache_endpoint_ttl:
+            if pattern.search(url):
+                return ttl
+        return None
+
+    def invalidate_cache(
+        self,
+        url: Optional[str] = None,
+        data: Optional[dict] = None,
+    ) -> None:
+        """
+        Drop cached responses.
+
+        Args:
+            url: Drop only responses of the project that the URL belongs to.
+
+                Defaults to `None`, which means the whole cache is dropped.
+            data: Data of the request sent to the URL, used to find other
+                affected projects, e.g. the forked one.
+
+                Defaults to `None`.
+        """
+        if self._response_cache is None:
+            return
+
+        if url is None:
+            self._response_cache.clear()
+            return
+
+        prefixes = {self._get_project_prefix(url)}
+        fork_suffix = None
+        if prefixes == {"fork"} and data:
+            # forking changes the forked project, creates
+            # `fork/<user>/<namespace>/<repo>` and changes the project listings
+            project = "/".join(
+                part for part in (data.get("namespace"), data.get("repo")) if part
+            )
+            prefixes.update((project, "projects"))
+            fork_suffix = f"/{project}"
+
+        def is_affected(key: Hashable) -> bool:
+            if not isinstance(key, tuple):
+                return False
+            prefix = key[0]
+            return prefix in prefixes or (
+                fork_suffix is not None
+                and prefix.startswith("fork/")
+                and prefix.endswith(fork_suffix)
+            )
+
+        self._response_cache.invalidate(is_affected)
+
     def get_raw_request(
         self,
         url,
@@ -233,6 +447,7 @@ class PagureService(BaseGitService):
         params=None,
         data=None,
         header=None,
+        timeout=None,
     ) -> RequestResponse:
         """
         Call API endpoint and wrap the response in `RequestResponse` type.
@@ -245,12 +460,12 @@ class PagureService(BaseGitService):
             params: HTTP(S) query parameters in form of a dictionary.
             data: Data to be sent in form of a dictionary.
             header: Header of the HTTP request.
+            timeout: Timeout of the request, overrides the default timeout
+                of the service.
 
         Returns:
-            `RequestResponse` object representing the response.
-
-        Raises:
-            ValueError, if JSON cannot be retrieved.
+            `RequestResponse` object representing the response, JSON content
+            is decoded on the first access.
         """
 
         response = self.session.request(
@@ -260,22 +475,50 @@ class PagureService(BaseGitService):
             headers=header or self.header,
             data=data,
             verify=not self.insecure,
+            timeout=timeout or self.timeout,
         )
 
-        json_output = None
-        try:
-            json_output = response.json()
-        except ValueError:
-            logger.debug(response.text)
-
         return RequestResponse(
             status_code=response.status_code,
             ok=response.ok,
             content=response.content,
-            json=json_output,
             reason=response.reason,
+            headers=list(response.headers.items()),
         )
 
+    @property
+    def download_session(self) -> requests.Session:
+        return self.session
+
+    def get_download_headers(self, url: str) -> dict[str, str]:
+        return self.header
+
+    def get_raw_stream(self, url: str) -> requests.Response:
+        """
+        Send GET request with streamed response, the content is not downloaded
+        until it is iterated over.
+
+        Args:
+            url: URL to be called.
+
+        Returns:
+            Streamed response, it is up to the caller to close it.
+        """
+        try:
+            return self.session.get(
+                url,
+                headers=self.header,
+                stream=True,
+                verify=not self.insecure,
+                timeout=self.timeout,
+            )
+        except requests.exceptions.ConnectionError as er:
+            logger.error(er)
+            raise OgrNetworkError(f"Cannot connect to url: '{url}'.") from er
+        except requests.exceptions.Timeout as er:
+            logger.error(er)
+            raise OgrNetworkError(f"Request to url '{url}' timed out.") from er
+
     @property
     def api_url(self):
         """URL to the Pagure API."""
@@ -319,9 +562,14 @@ class PagureService(BaseGitService):
         request_url = self.get_api_url("error_codes")
         return self.call_api(request_url)
 
+    @property
+    def _identity_key(self) -> Optional[str]:
+        return self._token
+
     def change_token(self, token: str):
         self._token = token
         self.header = {"Authorization": "token " + self._token}
+        self.invalidate_identity()
 
     def __handle_project_create_fail(
         self,
@@ -381,3 +629,59 @@ class PagureService(BaseGitService):
         """
         url = self.get_api_url("group", group_name)
         return PagureGroup(group_name, self.call_api(url))
+
+    def get_group_members(self, group_name: str) -> list[str]:
+        """
+        Get members of a Pagure group, cached for `acl_cache_ttl` seconds.
+        """
+        members = self._group_members.get(group_name)
+        if members is None:
+            members = self.get_group(group_name).members
+            self._group_members.set(group_name, members)
+        return members
+
+    def invalidate_group_members(self, group_name: Optional[str] = None) -> None:
+        """
+        Drop cached members of the groups.
+
+        Args:
+            group_name: Drop only members of this group.
+
+                Defaults to `None`, which means members of all groups are dropped.
+        """
+        if group_name is None:
+            self._group_members.clear()
+        else:
+            self._group_members.pop(group_name)
+
+    def get_groups_members(self, group_names: Iterable[str]) -> dict[str, list[str]]:
+        """
+        Get members of multiple Pagure groups, groups that are not cached
+        are fetched concurrently.
+
+        Args:
+            group_names: Names of the groups.
+
+        Returns:
+            Dictionary with group names as keys and lists of members as values.
+        """
+        result: dict[str, list[str]] = {}
+        missing = []
+        for group_name in group_names:
+            members = self._group_members.get(group_name)
+            if members is None:
+                missing.append(group_name)
+            else:
+                result[group_name] = members
+
+        if len(missing) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(missing)),
+            ) as executor:
+                result.update(
+                    zip(missing, executor.map(self.get_group_members, missing)),
+                )
+        else:
+            result.update((group, self.get_group_members(group)) for group in missing)
+
+        return result
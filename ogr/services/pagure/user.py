@@ -18,6 +18,9 @@ class PagureUser(BaseGitUser):
         return f'PagureUser(username="{self.get_username()}")'
 
     def get_username(self) -> str:
+        return self.service.get_cached_username(self.__whoami)
+
+    def __whoami(self) -> str:
         request_url = self.service.get_api_url("-", "whoami")
 
         return_value = self.service.call_api(url=request_url, method="POST", data={})
@@ -1,16 +1,30 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import copy
 import functools
+import hashlib
+import json as jsonlib
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from pathlib import Path
 from re import Match
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import requests
 
 from ogr.abstract import AnyComment, Comment
+from ogr.constant import DOWNLOAD_CHUNK_SIZE
+from ogr.exceptions import ChecksumMismatchError, OgrException, OgrNetworkError
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def filter_comments(
     comments: list[AnyComment],
@@ -84,10 +98,14 @@ class RequestResponse:
     """
     Class that holds response for Pagure requests.
 
+    JSON content is decoded lazily on the first access and only if the
+    response is not declared as a non-JSON content type.
+
     Attributes:
         status_code (int): Status code of the response.
         ok (bool): `True` if successful, `False` otherwise.
         content (bytes): Content of the response.
+        body (memoryview): Content of the response without copying.
         json_content (Optional[Dict[Any, Any]]): JSON content of the response.
     """
 
@@ -105,19 +123,83 @@ class RequestResponse:
         self.status_code = status_code
         self.ok = ok
         self.content = content
-        self.json_content = json
+        self._json_content = json
+        self._json_decoded = json is not None
+        # the response may be shared by multiple threads
+        self._json_lock = threading.Lock()
         self.reason = reason
         self.headers = dict(headers) if headers else None
         self.links = links
         self.exception = exception
 
+    @property
+    def body(self) -> memoryview:
+        return memoryview(self.content)
+
+    def copy(self) -> "RequestResponse":
+        """
+        Returns:
+            Copy of the response that can be modified without affecting
+            this one, e.g. when the response is shared by multiple callers.
+        """
+        response = RequestResponse(
+            status_code=self.status_code,
+            ok=self.ok,
+            content=self.content,
+            reason=self.reason,
+            headers=list(self.headers.items()) if self.headers else None,
+            links=list(self.links) if self.links else self.links,
+            exception=copy.deepcopy(self.exception),
+        )
+        # otherwise the copy decodes its own JSON content
+        if self._json_decoded:
+            response.json_content = copy.deepcopy(self._json_content)
+        return response
+
+    @property
+    def content_type(self) -> Optional[str]:
+        """
+        Returns:
+            Value of the `Content-Type` header, `None` if not present.
+        """
+        for header, value in (self.headers or {}).items():
+            if header.lower() == "content-type":
+                return value
+        return None
+
+    @property
+    def json_content(self) -> Optional[dict[Any, Any]]:
+        if not self._json_decoded:
+            with self._json_lock:
+                if not self._json_decoded:
+                    self._json_content = self._decode_json()
+                    self._json_decoded = True
+        return self._json_content
+
+    @json_content.setter
+    def json_content(self, json: Optional[dict[Any, Any]]) -> None:
+        self._json_content = json
+        self._json_decoded = True
+
+    def _decode_json(self) -> Optional[dict[Any, Any]]:
+        content_type = self.content_type
+        if not self.content or (
+            content_type is not None and "json" not in content_type
+        ):
+            return None
+        try:
+            return jsonlib.loads(self.content)
+        except ValueError:
+            logger.debug(self.content)
+            return None
+
     def __str__(self) -> str:
         return (
             f"RequestResponse("
             f"status_code={self.status_code}, "
             f"ok={self.ok}, "
             f"content={self.content.decode()}, "
-            f"json={self.json_content}, "
+            f"json={self._json_content if self._json_decoded else '<not decoded>'}, "
             f"reason={self.reason}, "
             f"headers={self.headers}, "
             f"links={self.links}, "
@@ -203,3 +285,279 @@ def indirect(specialized_function: Callable) -> Any:
         return indirectly_called
 
     return indirect_caller
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded in-memory cache with expiring entries.
+
+    Once the cache is full, the least recently used entry is evicted.
+
+    Attributes:
+        max_size (int): Maximum number of stored entries.
+        ttl (float): Default time to live of an entry in seconds.
+    """
+
+    def __init__(self, max_size: int = 128, ttl: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Args:
+            key: Key of the entry.
+            default: Value returned if the entry is missing or expired.
+
+        Returns:
+            Stored value, `default` if there is no valid entry.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store the value in the cache.
+
+        Args:
+            key: Key of the entry.
+            value: Value to be stored.
+            ttl: Time to live of the entry in seconds.
+
+                Defaults to `None`, which means the default TTL of the cache.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove the entry from the cache.
+
+        Returns:
+            Removed value, `default` if there was no such entry.
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else default
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove all entries whose key satisfies the predicate.
+
+        Args:
+            predicate: Function called with the key of each entry.
+
+        Returns:
+            Number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Deduplication of concurrent calls. While a call with a given key is
+    in flight, other callers with the same key wait for it and get its result
+    (or its exception) instead of performing the same call again.
+
+    Attributes:
+        calls (int): Number of performed calls.
+        coalesced (int): Number of callers that got the result of a call
+            performed by another caller.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __str__(self) -> str:
+        return f"SingleFlight(calls={self.calls}, coalesced={self.coalesced})"
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """
+        Call the function, unless a call with the same key is already in flight.
+
+        Args:
+            key: Key identifying the call, e.g. URL and credentials.
+            function: Function performing the call.
+
+        Returns:
+            Result of the function.
+        """
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result
+
+        try:
+            flight.result = function()
+        except BaseException as ex:
+            flight.exception = ex
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+        return flight.result
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Returns:
+            Counters of performed and coalesced calls.
+        """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+def _check_download_response(response: requests.Response, url: str) -> None:
+    if response.ok:
+        return
+
+    cls = OgrNetworkError if response.status_code >= 500 else OgrException
+    raise cls(f"Couldn't download {url} because {response.reason}.")
+
+
+def iter_response_content(
+    response: requests.Response,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Iterate over content of the streamed response, the response is closed
+    once the iteration ends.
+
+    Args:
+        response: Response of a request with `stream=True`.
+        chunk_size: Size of the chunks in bytes.
+
+    Returns:
+        Iterator over chunks of the content.
+    """
+    try:
+        yield from response.iter_content(chunk_size=chunk_size)
+    finally:
+        response.close()
+
+
+def download_file(
+    session: requests.Session,
+    url: str,
+    filename: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    checksum: Optional[str] = None,
+    hash_algorithm: str = "sha256",
+    resume: bool = False,
+    headers: Optional[dict[str, str]] = None,
+    **kwargs,
+) -> str:
+    """
+    Stream content from the URL into a file, the content is never held
+    in memory as a whole.
+
+    Args:
+        session: Session to be used for the request.
+        url: URL to be downloaded.
+        filename: Path to the file to save the content to.
+        chunk_size: Size of the chunks in bytes.
+        checksum: Expected hex digest of the content.
+
+            Defaults to `None`, which means the content is not verified.
+        hash_algorithm: Algorithm used for the digest, see `hashlib.new`.
+        resume: Continue with partially downloaded file using HTTP Range
+            request. If the server ignores the range, the download starts
+            from the beginning.
+        headers: Headers of the request.
+        **kwargs: Other arguments passed to `session.get`, e.g. `timeout`.
+
+    Returns:
+        Hex digest of the content.
+
+    Raises:
+        ChecksumMismatchError, if the digest does not match the `checksum`.
+    """
+    digest = hashlib.new(hash_algorithm)
+    offset = 0
+    if resume and Path(filename).is_file():
+        with open(filename, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+                offset += len(chunk)
+
+    headers = dict(headers or {})
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    with session.get(url, headers=headers, stream=True, **kwargs) as response:
+        # requested range starts at the end of the file, it is complete already
+        if not (offset and response.status_code == 416):
+            _check_download_response(response, url)
+            if offset and response.status_code != 206:
+                logger.debug(f"Range requests not supported for {url}, starting over.")
+                digest = hashlib.new(hash_algorithm)
+                offset = 0
+
+            with open(filename, "ab" if offset else "wb") as file:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    file.write(chunk)
+                    digest.update(chunk)
+
+    hexdigest = digest.hexdigest()
+    if checksum and hexdigest != checksum.lower():
+        raise ChecksumMismatchError(
+            f"Checksum of {url} saved to {filename} does not match: "
+            f"expected {checksum}, got {hexdigest}.",
+        )
+    return hexdigest
@@ -0,0 +1,62 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+
+import io
+
+import pytest
+import requests
+from flexmock import flexmock
+
+from ogr.services.forgejo import ForgejoPullRequest, ForgejoService
+
+
+def _response(status_code: int, content: bytes = b"") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(content)
+    return response
+
+
+@pytest.fixture
+def service():
+    return ForgejoService(instance_url="https://codeberg.org", api_key="abcdef")
+
+
+def test_iter_file_content(service):
+    project = service.get_project(repo="ogr", namespace="packit")
+    url = "https://codeberg.org/api/v1/repos/packit/ogr/raw/docs/README.md"
+    flexmock(service.download_session).should_receive("get").with_args(
+        url,
+        params={"ref": "main"},
+        headers={"Authorization": "token abcdef"},
+        stream=True,
+        timeout=None,
+    ).and_return(_response(200, b"content")).once()
+
+    assert b"".join(project.iter_file_content("docs/README.md", ref="main")) == (
+        b"content"
+    )
+
+
+def test_iter_file_content_not_found(service):
+    project = service.get_project(repo="ogr", namespace="packit")
+    flexmock(service.download_session).should_receive("get").and_return(
+        _response(404),
+    )
+
+    with pytest.raises(FileNotFoundError):
+        project.iter_file_content("missing")
+
+
+def test_iter_patch(service):
+    project = service.get_project(repo="ogr", namespace="packit")
+    pr = ForgejoPullRequest(raw_pr=flexmock(number=42), project=project)
+    flexmock(service.download_session).should_receive("get").with_args(
+        "https://codeberg.org/api/v1/repos/packit/ogr/pulls/42.patch",
+        headers={"Authorization": "token abcdef"},
+        stream=True,
+        timeout=None,
+    ).and_return(_response(200, b"patch")).once()
+
+    assert b"".join(pr.iter_patch()) == b"patch"
+    assert service.get_download_headers("https://example.com/file") == {}
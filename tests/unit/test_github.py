@@ -1,23 +1,51 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import datetime
+import io
+import json
+import threading
+import time
 from typing import Optional
 from unittest import TestCase
 
+import github
 import pytest
+import requests
 from flexmock import flexmock
+from github.Requester import HTTPSRequestsConnectionClass
+from requests.adapters import HTTPAdapter
 
 from ogr import GithubService
-from ogr.abstract import AuthMethod
-from ogr.exceptions import GithubAPIException
+from ogr.abstract import (
+    AuthMethod,
+    CommitStatus,
+    IssueStatus,
+    MergeCommitStatus,
+    PRStatus,
+)
+from ogr.exceptions import (
+    GithubAPIException,
+    OgrException,
+    OperationNotSupported,
+)
+from ogr.services.github import service as github_service
+from ogr.services.github.adapter import GithubAdapter, mount_github_adapter
+from ogr.services.github.auth_providers.github_app import GithubApp
 from ogr.services.github.auth_providers.token import TokenAuthentication
+from ogr.services.github.auth_providers.token_pool import TokenPool
 from ogr.services.github.auth_providers.tokman import Tokman
 from ogr.services.github.check_run import (
+    GithubCheckRun,
     GithubCheckRunOutput,
+    GithubCheckRunResult,
+    GithubCheckRunStatus,
     create_github_check_run_output,
 )
 from ogr.services.github.project import GithubProject
 from ogr.services.github.pull_request import GithubPullRequest
+from ogr.services.github.rate_limit import RateLimitScheduler
+from ogr.utils import TTLCache
 
 
 @pytest.fixture
@@ -116,6 +144,229 @@ class TestGithubProject:
         )
 
 
+def graphql_pr_node(number, merged=False, labels=(), contexts=()):
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "body": "",
+        "url": f"https://github.com/packit/ogr/pull/{number}",
+        "state": "MERGED" if merged else "OPEN",
+        "merged": merged,
+        "mergeable": "MERGEABLE",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-02T00:00:00Z",
+        "author": {"login": "alice"},
+        "mergeCommit": None,
+        "baseRefName": "main",
+        "baseRefOid": "b" * 40,
+        "headRefName": "feature",
+        "headRefOid": "a" * 40,
+        "headRepository": None,
+        "labels": {
+            "nodes": [
+                {"name": label, "color": "ffffff", "description": None}
+                for label in labels
+            ],
+        },
+        "commits": {
+            "nodes": [
+                {
+                    "commit": {
+                        "oid": "a" * 40,
+                        "status": {
+                            "contexts": [
+                                {
+                                    "context": context,
+                                    "state": state,
+                                    "description": None,
+                                    "targetUrl": None,
+                                    "createdAt": "2024-01-02T00:00:00Z",
+                                }
+                                for context, state in contexts
+                            ],
+                        },
+                    },
+                },
+            ],
+        },
+    }
+
+
+def test_pr_list_graphql():
+    service = GithubService(token="abcdef")
+    project = GithubProject(repo="ogr", namespace="packit", service=service)
+    requester = service.github.requester
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(url="https://api.github.com/repos/packit/ogr", requester=requester),
+    )
+    pages = [
+        {
+            "data": {
+                "repository": {
+                    "pullRequests": {
+                        "pageInfo": {"hasNextPage": True, "endCursor": "cursor"},
+                        "nodes": [
+                            graphql_pr_node(
+                                1,
+                                labels=["bug"],
+                                contexts=[("ci", "SUCCESS"), ("lint", "EXPECTED")],
+                            ),
+                        ],
+                    },
+                },
+            },
+        },
+        {
+            "data": {
+                "repository": {
+                    "pullRequests": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "nodes": [graphql_pr_node(2, merged=True)],
+                    },
+                },
+            },
+        },
+    ]
+    flexmock(requester).should_receive("graphql_query").and_return(
+        ({}, pages[0]),
+    ).and_return(({}, pages[1])).twice()
+    flexmock(requester).should_receive("requestJsonAndCheck").never()
+
+    first, second = project.get_pr_list_graphql(status=PRStatus.all)
+
+    assert first.id == 1
+    assert first.status == PRStatus.open
+    assert first.author == "alice"
+    assert first.head_commit == "a" * 40
+    assert first.merge_commit_status == MergeCommitStatus.can_be_merged
+    assert [label.name for label in first.labels] == ["bug"]
+    assert [(flag.context, flag.state) for flag in first.get_statuses()] == [
+        ("ci", CommitStatus.success),
+        ("lint", CommitStatus.pending),
+    ]
+    assert second.status == PRStatus.merged
+    assert second.labels == []
+
+
+def test_pr_list_graphql_ghost_author_and_lazy_fields():
+    service = GithubService(token="abcdef")
+    project = GithubProject(repo="ogr", namespace="packit", service=service)
+    requester = service.github.requester
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(url="https://api.github.com/repos/packit/ogr", requester=requester),
+    )
+    node = graphql_pr_node(1)
+    node["author"] = None
+    flexmock(requester).should_receive("graphql_query").and_return(
+        (
+            {},
+            {
+                "data": {
+                    "repository": {
+                        "pullRequests": {
+                            "pageInfo": {"hasNextPage": False, "endCursor": None},
+                            "nodes": [node],
+                        },
+                    },
+                },
+            },
+        ),
+    ).once()
+    flexmock(requester).should_receive("requestJsonAndCheck").replace_with(
+        lambda verb, url, **_: (
+            {},
+            (
+                {"closed_at": "2024-01-03T00:00:00Z"}
+                if (verb, url)
+                == ("GET", "https://api.github.com/repos/packit/ogr/pulls/1")
+                else None
+            ),
+        ),
+    ).once()
+
+    (pr,) = project.get_pr_list_graphql(status=PRStatus.all)
+
+    assert pr.author == "ghost"
+    assert pr._raw_pr.closed_at is not None
+
+
+def test_merged_pr_list_is_lazy():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    fetched = []
+
+    def get_pulls(**_):
+        for number, merged_at in enumerate(["2024-01-01", None, "2024-01-02", None]):
+            fetched.append(number)
+            yield flexmock(number=number, merged_at=merged_at, state="closed")
+
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(get_pulls=get_pulls),
+    )
+
+    prs = project.iter_pr_list(status=PRStatus.merged)
+    assert [next(prs).id, next(prs).id] == [0, 2]
+    assert fetched == [0, 1, 2]
+
+    merged = project.get_pr_list(status=PRStatus.merged)
+    assert [pr.id for pr in merged] == [0, 2]
+    assert all(pr.status == PRStatus.merged for pr in merged)
+    assert [pr.status for pr in project.get_pr_list(status=PRStatus.closed)] == [
+        PRStatus.merged,
+        PRStatus.closed,
+        PRStatus.merged,
+        PRStatus.closed,
+    ]
+
+
+def test_collaborator_permissions_from_listing():
+    project = GithubProject(
+        repo="ogr",
+        namespace="packit",
+        service=GithubService(acl_cache_ttl=60),
+    )
+
+    def collaborator(login, *permissions):
+        levels = {"admin", "maintain", "push", "triage", "pull"}
+        return flexmock(
+            login=login,
+            permissions=flexmock(
+                **{level: level in permissions for level in levels},
+            ),
+        )
+
+    github_repo = flexmock()
+    github_repo.should_receive("get_collaborators").and_return(
+        [
+            collaborator("alice", "admin", "push", "pull"),
+            collaborator("bob", "maintain", "push", "pull"),
+            collaborator("carol", "triage", "pull"),
+        ],
+    ).once()
+    github_repo.should_receive("get_collaborator_permission").never()
+    flexmock(project).should_receive("github_repo").and_return(github_repo)
+
+    assert project.who_can_merge_pr() == {"alice", "bob"}
+    assert project.users_with_write_access() == {"alice", "bob"}
+    assert project.can_merge_pr("bob")
+    assert not project.can_merge_pr("carol")
+    assert not project.can_merge_pr("dave")
+
+
+def test_collaborators_not_cached_by_default():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    github_repo = flexmock()
+    github_repo.should_receive("get_collaborators").and_return([]).twice()
+    github_repo.should_receive("get_collaborator_permission").with_args(
+        "alice",
+    ).and_return("read").twice()
+    flexmock(project).should_receive("github_repo").and_return(github_repo)
+
+    assert not project.who_can_merge_pr()
+    assert not project.who_can_merge_pr()
+    assert not project.can_merge_pr("alice")
+    assert not project.can_merge_pr("alice")
+
+
 class TestGitHubService(TestCase):
     def test_hostname(self):
         assert GithubService().hostname == "github.com"
@@ -203,3 +454,687 @@ def test_no_set_reset_customized_auth_method(github_service_with_one_auth_method
     with pytest.raises(GithubAPIException):
         service.set_auth_method(AuthMethod.github_app)
     assert isinstance(service.authentication, Tokman)
+
+
+def test_github_app_caches_installations_and_tokens():
+    app = GithubApp("123", "private-key", None)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    integration = flexmock()
+    integration.should_receive("get_repo_installation").with_args(
+        "packit",
+        "ogr",
+    ).and_return(flexmock(id=42)).once()
+    integration.should_receive("get_access_token").with_args(42).and_return(
+        flexmock(token="expiring", expires_at=now + datetime.timedelta(minutes=1)),
+    ).and_return(
+        flexmock(token="fresh", expires_at=now + datetime.timedelta(hours=1)),
+    ).twice()
+    app._integration = integration
+
+    assert app.get_token("packit", "ogr") == "expiring"
+    # refreshed shortly before expiry, installation of the owner is reused
+    assert app.get_token("packit", "packit") == "fresh"
+    assert app.get_token("packit", "ogr") == "fresh"
+
+
+def connection_adapter(pygithub_instance):
+    connection = pygithub_instance.requester._Requester__createConnection()
+    return connection.session.get_adapter("https://api.github.com")
+
+
+def test_connection_pool_shared_per_token():
+    service = GithubService(token="abcdef")
+    first = GithubProject(repo="ogr", namespace="packit", service=service)
+    second = GithubProject(repo="packit", namespace="packit", service=service)
+    assert first.github_instance is not second.github_instance
+    assert connection_adapter(first.github_instance) is connection_adapter(
+        second.github_instance,
+    )
+
+    # pools for expired tokens are not kept
+    service.change_token("ghijkl")
+    flexmock(service.authentication).should_receive("get_token_expiration").and_return(
+        datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=1),
+    )
+    assert connection_adapter(
+        service.get_pygithub_instance("packit", "ogr"),
+    ) is not connection_adapter(service.get_pygithub_instance("packit", "ogr"))
+
+
+def test_projects_sharing_pool_in_threads(monkeypatch):
+    service = GithubService(token="abcdef")
+    # PyGithub stores the request on the connection before sending it,
+    # both requests are stored before either of them is sent
+    barrier = threading.Barrier(2, timeout=5)
+    store_request = HTTPSRequestsConnectionClass.request
+
+    def request(connection, *args, **kwargs):
+        store_request(connection, *args, **kwargs)
+        barrier.wait()
+
+    def send(request, **_):
+        name = request.url.rsplit("/", 1)[-1]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {"name": name, "full_name": f"packit/{name}", "owner": {"login": "packit"}},
+        ).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    monkeypatch.setattr(HTTPSRequestsConnectionClass, "request", request)
+    flexmock(HTTPAdapter).should_receive("send").replace_with(send)
+
+    names = {}
+
+    def get_repo_name(repo):
+        project = GithubProject(repo=repo, namespace="packit", service=service)
+        names[repo] = project.github_repo.name
+
+    threads = [
+        threading.Thread(target=get_repo_name, args=(repo,)) for repo in ("a", "b")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert names == {"a": "a", "b": "b"}
+
+
+def test_tag_lookup_is_indexed():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    listed = []
+
+    def tag(name, sha):
+        return flexmock(name=name, commit=flexmock(sha=sha))
+
+    def get_tags():
+        for name, sha in (("0.2.0", "c2"), ("0.1.0", "c1")):
+            listed.append(name)
+            yield tag(name, sha)
+
+    github_repo = flexmock()
+    github_repo.should_receive("get_tags").replace_with(get_tags).times(3)
+    flexmock(project).should_receive("github_repo").and_return(github_repo)
+
+    # the listing stops at the requested tag
+    assert project.get_sha_from_tag("0.2.0") == "c2"
+    assert listed == ["0.2.0"]
+
+    assert project.get_tag_from_tag_name("0.1.0").commit_sha == "c1"
+    assert project.get_sha_from_tag("0.2.0") == "c2"
+    assert listed == ["0.2.0", "0.1.0"]
+
+    # a missing tag is looked up in a new listing once
+    assert project.get_tag_from_tag_name("missing") is None
+    with pytest.raises(GithubAPIException):
+        project.get_sha_from_tag("missing")
+
+
+def test_release_lookup_by_name_is_indexed():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    titles = ["0.3.0", "0.2.0", "0.1.0"]
+    listed = []
+
+    def get_releases():
+        for title in titles:
+            listed.append(title)
+            yield flexmock(title=title, tag_name=title)
+
+    github_repo = flexmock(get_releases=get_releases)
+    github_repo.should_receive("get_release").never()
+    flexmock(project).should_receive("github_repo").and_return(github_repo)
+
+    assert project.get_release(name="0.2.0").tag_name == "0.2.0"
+    assert listed == ["0.3.0", "0.2.0"]
+
+    assert project.get_release(name="0.3.0").tag_name == "0.3.0"
+    assert project.get_release(name="0.1.0").tag_name == "0.1.0"
+    assert listed == ["0.3.0", "0.2.0", "0.1.0"]
+
+    # the listing is exhausted, releases are listed again once
+    listed.clear()
+    with pytest.raises(GithubAPIException):
+        project.get_release(name="0.4.0")
+    assert listed == ["0.3.0", "0.2.0", "0.1.0"]
+
+    # release created outside of the project object
+    titles.insert(0, "0.4.0")
+    assert project.get_release(name="0.4.0").tag_name == "0.4.0"
+
+
+def test_release_lookup_by_tag_name():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    releases = [
+        flexmock(title="draft", tag_name="0.5.0", draft=True),
+        flexmock(title="test", tag_name="0.4.1", draft=False),
+    ]
+
+    github_repo = flexmock()
+    github_repo.should_receive("get_releases").and_return(releases).twice()
+    github_repo.should_receive("get_release").never()
+    flexmock(project).should_receive("github_repo").and_return(github_repo)
+
+    assert project.get_release(tag_name="0.4.1").title == "test"
+    # both indexes are filled from the same listing, including drafts
+    assert project.get_release(name="draft").tag_name == "0.5.0"
+    assert project.get_release(tag_name="0.5.0").title == "draft"
+
+    # the listing is exhausted, releases are listed again once
+    with pytest.raises(GithubAPIException):
+        project.get_release(tag_name="missing")
+
+
+def test_mount_github_adapter():
+    pygithub_instance = github.Github()
+    adapter = GithubAdapter(cache=TTLCache())
+    mount_github_adapter(pygithub_instance, adapter)
+
+    # `mount_github_adapter` relies on the private connection of the requester
+    assert connection_adapter(pygithub_instance) is adapter
+
+
+def test_mount_github_adapter_unsupported_pygithub():
+    pygithub_instance = github.Github()
+    flexmock(pygithub_instance, requester=object())
+
+    with pytest.raises(OgrException):
+        mount_github_adapter(pygithub_instance, GithubAdapter(cache=TTLCache()))
+
+
+def test_plain_pygithub_instance_for_unsupported_pygithub():
+    service = GithubService(token="abcdef")
+    cached_service = GithubService(token="abcdef", conditional_requests=True)
+    flexmock(github_service).should_receive("mount_github_adapter").and_raise(
+        OgrException,
+    )
+
+    assert service.get_pygithub_instance("packit", "ogr")
+    with pytest.raises(OgrException):
+        cached_service.get_pygithub_instance("packit", "ogr")
+
+
+def test_adapter_mounted_once():
+    service = GithubService(token="abcdef", conditional_requests=True)
+    assert isinstance(connection_adapter(service.github), GithubAdapter)
+
+    flexmock(github_service).should_receive("mount_github_adapter").never()
+    service.github  # noqa: B018
+
+
+def test_adapter_mounted_after_token_change():
+    scheduler = RateLimitScheduler()
+    service = GithubService(token="abcdef", rate_limit_scheduler=scheduler)
+    service.change_token("ghijkl")
+
+    adapter = connection_adapter(service.github)
+    assert isinstance(adapter, GithubAdapter)
+    assert adapter.scheduler is scheduler
+
+
+def test_conditional_requests_serve_cached_body_on_not_modified():
+    service = GithubService(token="abcdef", conditional_requests=True)
+    adapter = connection_adapter(service.get_pygithub_instance("packit", "ogr"))
+    request = requests.Request(
+        "GET",
+        "https://api.github.com/repos/packit/ogr",
+        headers={"Authorization": "token abcdef"},
+    ).prepare()
+
+    def response(status_code, content=b"", **headers):
+        raw = requests.Response()
+        raw.status_code = status_code
+        raw._content = content
+        raw.raw = io.BytesIO(content)
+        raw.headers.update(headers)
+        return raw
+
+    flexmock(HTTPAdapter).should_receive("send").replace_with(
+        lambda request, **_: (
+            response(304, **{"ETag": '"v1"', "X-RateLimit-Remaining": "4999"})
+            if request.headers.get("If-None-Match") == '"v1"'
+            else response(200, b'{"name": "ogr"}', ETag='"v1"')
+        ),
+    )
+
+    assert adapter.send(request.copy()).json() == {"name": "ogr"}
+    cached = adapter.send(request.copy())
+    assert cached.status_code == 200
+    assert cached.json() == {"name": "ogr"}
+    assert cached.headers["X-RateLimit-Remaining"] == "4999"
+
+
+def rate_limit_headers(remaining, reset_in=3600, **headers):
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+        "X-RateLimit-Resource": "core",
+        **headers,
+    }
+
+
+def test_rate_limit_scheduler_prefers_interactive_calls():
+    scheduler = RateLimitScheduler(reserve=10)
+    assert scheduler.get_budget() is None
+
+    scheduler.update("core", 200, rate_limit_headers(5))
+    assert scheduler.get_budget().remaining == 5
+
+    # interactive calls may use the reserve
+    scheduler.acquire()
+    assert scheduler.get_budget().remaining == 4
+
+    acquired = threading.Event()
+
+    def background_call():
+        with scheduler.background():
+            scheduler.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=background_call, daemon=True)
+    thread.start()
+    assert not acquired.wait(0.2)
+
+    # limit has been reset
+    scheduler.update("core", 200, rate_limit_headers(5000, reset_in=1))
+    assert acquired.wait(5)
+    thread.join()
+
+
+def test_github_adapter_waits_for_rate_limit():
+    scheduler = RateLimitScheduler()
+    adapter = GithubAdapter(scheduler=scheduler)
+    request = requests.Request(
+        "GET",
+        "https://api.github.com/repos/packit/ogr",
+    ).prepare()
+
+    def response(status_code, headers):
+        raw = requests.Response()
+        raw.status_code = status_code
+        raw._content = b"{}"
+        raw.raw = io.BytesIO(b"{}")
+        raw.headers.update(headers)
+        return raw
+
+    flexmock(HTTPAdapter).should_receive("send").and_return(
+        response(403, rate_limit_headers(100, **{"Retry-After": "0"})),
+    ).and_return(response(200, rate_limit_headers(4999))).twice()
+
+    assert adapter.send(request).status_code == 200
+    assert scheduler.get_budget().remaining == 4999
+
+
+def test_raw_downloads_use_authenticated_service_session():
+    service = GithubService(token="abcdef", download_timeout=(1.0, 5.0))
+    project = GithubProject(repo="ogr", namespace="packit", service=service)
+    raw_pr = flexmock(patch_url="https://github.com/packit/ogr/pull/1.patch")
+    pr = GithubPullRequest(raw_pr=raw_pr, project=project)
+
+    assert service.get_download_headers(
+        "https://api.github.com/repos/packit/ogr/tarball/0.1.0",
+    ) == {"Authorization": "token abcdef"}
+    assert service.get_download_headers("https://example.com/file") == {}
+
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b"patch"
+    flexmock(service.download_session).should_receive("get").with_args(
+        raw_pr.patch_url,
+        headers={"Authorization": "token abcdef"},
+        stream=False,
+        timeout=(1.0, 5.0),
+    ).and_return(response).once()
+
+    assert pr.patch == b"patch"
+    assert service.download_session is service.download_session
+
+
+def test_issue_list_graphql_is_lazy_and_requires_all_labels():
+    service = GithubService(token="abcdef")
+    project = GithubProject(repo="ogr", namespace="packit", service=service)
+    requester = service.github.requester
+    flexmock(project).should_receive("has_issues").and_return(True)
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(url="https://api.github.com/repos/packit/ogr", requester=requester),
+    )
+
+    def node(number, labels):
+        return {
+            "number": number,
+            "title": f"Issue {number}",
+            "body": "",
+            "url": f"https://github.com/packit/ogr/issues/{number}",
+            "state": "OPEN",
+            "createdAt": "2024-01-01T00:00:00Z",
+            "updatedAt": "2024-01-02T00:00:00Z",
+            "author": {"login": "alice"} if number == 1 else None,
+            "assignees": {"nodes": [{"login": "bob"}]},
+            "labels": {
+                "nodes": [
+                    {"name": name, "color": "ffffff", "description": ""}
+                    for name in labels
+                ],
+            },
+        }
+
+    page = {
+        "data": {
+            "repository": {
+                "issues": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "cursor"},
+                    "nodes": [node(1, ["bug"]), node(2, ["bug", "easy"])],
+                },
+            },
+        },
+    }
+    flexmock(requester).should_receive("graphql_query").and_return(
+        ({}, page),
+    ).once()
+    flexmock(requester).should_receive("requestJsonAndCheck").never()
+
+    issues = project.iter_issue_list(labels=["bug", "easy"])
+    issue = next(issues)
+
+    assert issue.id == 2
+    assert issue.status == IssueStatus.open
+    assert issue.author == "ghost"
+    assert [assignee.login for assignee in issue.assignees] == ["bob"]
+    assert [label.name for label in issue.labels] == ["bug", "easy"]
+
+
+def test_latest_commit_statuses_use_combined_status():
+    service = GithubService(token="abcdef")
+    project = GithubProject(repo="ogr", namespace="packit", service=service)
+    requester = service.github.requester
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(url="https://api.github.com/repos/packit/ogr", requester=requester),
+    )
+    for page, statuses in enumerate(
+        (
+            [{"id": i, "state": "success", "context": f"ci-{i}"} for i in range(100)],
+            [{"id": 100, "state": "pending", "context": "lint"}],
+        ),
+        start=1,
+    ):
+        flexmock(requester).should_receive("requestJsonAndCheck").with_args(
+            "GET",
+            "https://api.github.com/repos/packit/ogr/commits/abcdef/status",
+            parameters={"per_page": 100, "page": page},
+        ).and_return(
+            (
+                {},
+                {
+                    "state": "pending",
+                    "sha": "abcdef",
+                    "total_count": 101,
+                    "statuses": statuses,
+                },
+            ),
+        ).once()
+
+    flags = project.get_latest_commit_statuses("abcdef")
+    assert len(flags) == 101
+    assert (flags[0].context, flags[0].state) == ("ci-0", CommitStatus.success)
+    assert (flags[-1].context, flags[-1].state) == ("lint", CommitStatus.pending)
+
+
+def annotation(line):
+    return {
+        "path": "ogr/abstract.py",
+        "start_line": line,
+        "end_line": line,
+        "annotation_level": "warning",
+        "message": "line too long",
+    }
+
+
+def test_check_run_annotations_sent_in_batches():
+    project = GithubProject(repo="ogr", namespace="packit", service=GithubService())
+    raw_check_run = flexmock()
+    flexmock(project).should_receive("github_repo").and_return(
+        flexmock(create_check_run=lambda **kwargs: raw_check_run),
+    )
+    sent = []
+    raw_check_run.should_receive("edit").replace_with(
+        lambda output, **kwargs: sent.append(output),
+    )
+
+    GithubCheckRun.create(
+        project,
+        "lint",
+        "abcdef",
+        output=create_github_check_run_output(
+            "Lint",
+            "120 warnings",
+            annotations=[annotation(line) for line in range(120)],
+        ),
+    )
+
+    assert [len(output["annotations"]) for output in sent] == [50, 20]
+    assert all(output["title"] == "Lint" for output in sent)
+
+
+def test_check_run_updates_are_coalesced():
+    raw_check_run = flexmock(output=flexmock(title="Lint", summary="Running"))
+    check_run = GithubCheckRun(project=flexmock(), raw_check_run=raw_check_run)
+    sent = []
+    raw_check_run.should_receive("edit").replace_with(
+        lambda **kwargs: sent.append(kwargs),
+    )
+
+    with check_run.coalesced_updates(interval=3600) as updater:
+        updater.update(status=GithubCheckRunStatus.in_progress)
+        updater.update(output=create_github_check_run_output("Lint", "1 file"))
+        updater.update(
+            output=create_github_check_run_output(
+                "Lint",
+                "2 files",
+                annotations=[annotation(1)],
+            ),
+        )
+        updater.update(output={"annotations": [annotation(2)]})
+        assert len(sent) == 1
+
+    assert sent[1]["output"]["summary"] == "2 files"
+    assert len(sent[1]["output"]["annotations"]) == 2
+
+    updater.update(conclusion=GithubCheckRunResult.success)
+    assert sent[2]["conclusion"] == "success"
+
+
+def test_check_run_updates_kept_pending_on_failure():
+    raw_check_run = flexmock(output=flexmock(title="Lint", summary="Running"))
+    check_run = GithubCheckRun(project=flexmock(), raw_check_run=raw_check_run)
+    sent = []
+
+    def edit(**kwargs):
+        if not sent:
+            sent.append(None)
+            raise GithubAPIException("failed")
+        sent.append(kwargs)
+
+    raw_check_run.should_receive("edit").replace_with(edit)
+
+    updater = check_run.coalesced_updates(interval=3600)
+    with pytest.raises(GithubAPIException):
+        updater.update(
+            status=GithubCheckRunStatus.in_progress,
+            output={"annotations": [annotation(1)]},
+        )
+    updater.update(output=create_github_check_run_output("Lint", "1 file"))
+    updater.flush()
+
+    assert sent[1]["status"] == "in_progress"
+    assert sent[1]["output"]["summary"] == "1 file"
+    assert len(sent[1]["output"]["annotations"]) == 1
+
+
+def test_check_run_background_update_error_raised_on_flush():
+    raw_check_run = flexmock(output=flexmock(title="Lint", summary="Running"))
+    check_run = GithubCheckRun(project=flexmock(), raw_check_run=raw_check_run)
+    sent = []
+    failed = threading.Event()
+
+    def edit(**kwargs):
+        if len(sent) == 1 and not failed.is_set():
+            failed.set()
+            raise GithubAPIException("failed")
+        sent.append(kwargs)
+
+    raw_check_run.should_receive("edit").replace_with(edit)
+
+    updater = check_run.coalesced_updates(interval=0.1)
+    updater.update(status=GithubCheckRunStatus.in_progress)
+    updater.update(output=create_github_check_run_output("Lint", "1 file"))
+    assert failed.wait(timeout=5)
+    while updater._error is None:
+        time.sleep(0.01)
+
+    with pytest.raises(GithubAPIException):
+        updater.flush()
+    updater.flush()
+    assert sent[1]["output"]["summary"] == "1 file"
+
+
+def test_check_run_update_requires_title_and_summary():
+    raw_check_run = flexmock(output=flexmock(title=None, summary=None))
+    check_run = GithubCheckRun(project=flexmock(), raw_check_run=raw_check_run)
+    raw_check_run.should_receive("edit").never()
+
+    updater = check_run.coalesced_updates(interval=3600)
+    with pytest.raises(OperationNotSupported):
+        updater.update(output={"annotations": [annotation(1)]})
+    updater.flush()
+
+
+def test_token_pool_balances_requests_by_remaining_budget():
+    service = GithubService(tokens=["token-a", "token-b"])
+    pool = service.authentication
+    assert isinstance(pool, TokenPool)
+
+    adapter = GithubAdapter(token_pool=pool)
+    request = requests.Request(
+        "GET",
+        "https://api.github.com/repos/packit/ogr",
+    ).prepare()
+    sent_with = []
+
+    def send(request, **_):
+        token = request.headers["Authorization"].split()[-1]
+        sent_with.append(token)
+        response = requests.Response()
+        response._content = b"{}"
+        response.raw = io.BytesIO(b"{}")
+        if token == "token-a" and len(sent_with) == 3:
+            # secondary rate limit
+            response.status_code = 403
+            response.headers.update(rate_limit_headers(4000, **{"Retry-After": "60"}))
+        else:
+            response.status_code = 200
+            response.headers.update(
+                rate_limit_headers(4000 if token == "token-a" else 3000),
+            )
+        return response
+
+    flexmock(HTTPAdapter).should_receive("send").replace_with(send)
+
+    adapter.send(request)
+    adapter.send(request)
+    # token-a has more budget left, but gets quarantined
+    assert adapter.send(request).status_code == 200
+    assert adapter.send(request).status_code == 200
+
+    assert sent_with == ["token-a", "token-b", "token-a", "token-b", "token-b"]
+    usage = pool.get_usage()
+    assert [(token.token, token.requests) for token in usage] == [
+        ("t***a", 2),
+        ("t***b", 3),
+    ]
+    assert usage[0].quarantined_until is not None
+    assert usage[1].remaining == 3000
+
+
+def test_token_pool_pins_writes_and_user_to_first_token():
+    service = GithubService(tokens=["token-a", "token-b"])
+    pool = service.authentication
+    flexmock(pool).should_receive("select_token").and_return("token-b")
+
+    assert (
+        pool.select_request_token("GET", "https://api.github.com/repos/packit/ogr")
+        == "token-b"
+    )
+    assert (
+        pool.select_request_token(
+            "POST",
+            "https://api.github.com/repos/packit/ogr/issues",
+        )
+        == "token-a"
+    )
+    assert pool.select_request_token("GET", "https://api.github.com/user") == "token-a"
+    assert (
+        pool.select_request_token(
+            "GET",
+            "https://github.example.com/api/v3/user/emails",
+        )
+        == "token-a"
+    )
+    assert (
+        pool.select_request_token("GET", "https://api.github.com/users/packit")
+        == "token-b"
+    )
+    assert service._identity_key == GithubService(token="token-a")._identity_key
+
+
+def test_token_pool_cannot_be_combined_with_scheduler():
+    with pytest.raises(ValueError, match="cannot be combined"):
+        GithubService(
+            tokens=["token-a", "token-b"],
+            rate_limit_scheduler=RateLimitScheduler(),
+        )
+    with pytest.raises(ValueError, match="cannot be combined"):
+        GithubAdapter(
+            scheduler=RateLimitScheduler(),
+            token_pool=TokenPool(["token-a"]),
+        )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"tokens": ["token-a", "token-b"]},
+        {"github_authentication": TokenPool(["token-a", "token-b"])},
+        {"token": "abcdef", "rate_limit_scheduler": RateLimitScheduler()},
+    ],
+)
+def test_rate_limited_requests_are_not_retried(kwargs):
+    service = GithubService(**kwargs)
+    assert 403 not in service._max_retries.status_forcelist
+    assert 403 in GithubService(token="abcdef")._max_retries.status_forcelist
+
+
+def test_identity_key_follows_credentials():
+    service = GithubService(token="abcdef")
+    key = service._identity_key
+    assert key == GithubService(token="abcdef")._identity_key
+
+    service.change_token("ghijkl")
+    assert service._identity_key != key
+
+
+def test_repo_lookup_shares_only_data():
+    service = GithubService(token="abcdef")
+    raw_data = {"name": "ogr", "full_name": "packit/ogr", "owner": {"login": "packit"}}
+    flexmock(service.single_flight).should_receive("do").with_args(
+        ("repo", "packit/ogr", service._identity_key),
+        object,
+    ).and_return((raw_data, {})).twice()
+
+    first = GithubProject(repo="ogr", namespace="packit", service=service)
+    second = GithubProject(repo="ogr", namespace="packit", service=service)
+    assert first.github_repo.name == second.github_repo.name == "ogr"
+    # each project uses its own PyGithub instance
+    assert first.github_repo.requester is first.github_instance.requester
+    assert second.github_repo.requester is second.github_instance.requester
@@ -1,9 +1,14 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
+import io
 from unittest import TestCase
 
+import requests
+from flexmock import flexmock
+
 from ogr import GitlabService
+from ogr.services.gitlab.pull_request import GitlabPullRequest
 
 
 class TestGitlabService(TestCase):
@@ -13,3 +18,23 @@ class TestGitlabService(TestCase):
             GitlabService(instance_url="https://gitlab.gnome.org").hostname
             == "gitlab.gnome.org"
         )
+
+
+def test_iter_patch_uses_authenticated_session():
+    service = GitlabService(token="abcdef", instance_url="https://gitlab.example.com")
+    project = flexmock(service=service)
+    url = "https://gitlab.example.com/packit/ogr/-/merge_requests/1"
+    pr = GitlabPullRequest(raw_pr=flexmock(web_url=url), project=project)
+
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(b"patch")
+    flexmock(service.download_session).should_receive("get").with_args(
+        f"{url}.patch",
+        headers={"PRIVATE-TOKEN": "abcdef"},
+        stream=True,
+        timeout=None,
+    ).and_return(response).once()
+
+    assert b"".join(pr.iter_patch()) == b"patch"
+    assert service.get_download_headers("https://example.com/file") == {}
@@ -3,10 +3,406 @@
 
 from unittest import TestCase
 
+import pytest
+import requests
+from flexmock import flexmock
+
 from ogr import PagureService
+from ogr.abstract import AccessLevel, GitTag
+from ogr.exceptions import OgrNetworkError, OperationNotSupported
+from ogr.services.pagure import PagureProject, PagureRelease
+from ogr.utils import RequestResponse
 
 
 class TestPagureService(TestCase):
     def test_hostname(self):
         assert PagureService().hostname == "src.fedoraproject.org"
         assert PagureService(instance_url="https://pagure.io").hostname == "pagure.io"
+
+
+@pytest.fixture
+def cached_service():
+    service = PagureService(
+        token="abcdef",
+        instance_url="https://pagure.io",
+        cache_size=16,
+        cache_endpoint_ttl={"/git/branches": 0},
+    )
+    flexmock(service)
+    return service
+
+
+def test_cache_get_requests(cached_service):
+    url = cached_service.get_api_url("rpms", "python-ogr")
+    cached_service.should_receive("get_raw_request").with_args(
+        method="GET",
+        url=url,
+        params=None,
+        data=None,
+        timeout=None,
+    ).and_return(RequestResponse(200, True, b"{}", json={"name": "python-ogr"})).once()
+
+    assert cached_service.call_api(url) == {"name": "python-ogr"}
+    assert cached_service.call_api(url) == {"name": "python-ogr"}
+
+
+def test_cache_endpoint_ttl(cached_service):
+    url = cached_service.get_api_url("rpms", "python-ogr", "git", "branches")
+    cached_service.should_receive("get_raw_request").and_return(
+        RequestResponse(200, True, b"{}", json={"branches": []}),
+    ).twice()
+
+    cached_service.call_api(url)
+    cached_service.call_api(url)
+
+
+def test_cache_invalidated_by_post(cached_service):
+    project_url = cached_service.get_api_url("rpms", "python-ogr")
+    other_url = cached_service.get_api_url("rpms", "packit")
+    cached_service.should_receive("get_raw_request").with_args(
+        method="GET",
+        url=project_url,
+        params=None,
+        data=None,
+        timeout=None,
+    ).and_return(RequestResponse(200, True, b"{}", json={"name": "python-ogr"})).twice()
+    cached_service.should_receive("get_raw_request").with_args(
+        method="GET",
+        url=other_url,
+        params=None,
+        data=None,
+        timeout=None,
+    ).and_return(RequestResponse(200, True, b"{}", json={"name": "packit"})).once()
+    cached_service.should_receive("get_raw_request").with_args(
+        method="POST",
+        url=f"{project_url}/issue/1/comment",
+        params=None,
+        data={"comment": "hi"},
+        timeout=None,
+    ).and_return(RequestResponse(200, True, b"{}", json={"message": "ok"})).once()
+
+    cached_service.call_api(project_url)
+    cached_service.call_api(other_url)
+    cached_service.call_api(
+        f"{project_url}/issue/1/comment",
+        method="POST",
+        data={"comment": "hi"},
+    )
+    cached_service.call_api(project_url)
+    cached_service.call_api(other_url)
+
+
+def test_cached_response_not_shared_between_callers(cached_service):
+    url = cached_service.get_api_url("rpms", "python-ogr")
+    cached_service.should_receive("get_raw_request").and_return(
+        RequestResponse(200, True, b'{"name": "python-ogr"}'),
+    ).once()
+
+    cached_service.call_api(url)["name"] = "changed"
+    assert cached_service.call_api(url) == {"name": "python-ogr"}
+
+
+def test_cache_invalidated_by_fork(cached_service):
+    project_url = cached_service.get_api_url("rpms", "python-ogr")
+    fork_url = cached_service.get_api_url("fork", "user", "rpms", "python-ogr")
+    forks_url = cached_service.get_api_url("projects")
+    for url in (project_url, fork_url, forks_url):
+        cached_service.should_receive("get_raw_request").with_args(
+            method="GET",
+            url=url,
+            params=None,
+            data=None,
+            timeout=None,
+        ).and_return(RequestResponse(200, True, b"{}", json={"url": url})).twice()
+    cached_service.should_receive("get_raw_request").with_args(
+        method="POST",
+        url=cached_service.get_api_url("fork"),
+        params=None,
+        data={"repo": "python-ogr", "namespace": "rpms", "wait": True},
+        timeout=None,
+    ).and_return(RequestResponse(200, True, b"{}", json={"message": "ok"})).once()
+
+    for url in (project_url, fork_url, forks_url):
+        cached_service.call_api(url)
+    cached_service.call_api(
+        cached_service.get_api_url("fork"),
+        method="POST",
+        data={"repo": "python-ogr", "namespace": "rpms", "wait": True},
+    )
+    for url in (project_url, fork_url, forks_url):
+        cached_service.call_api(url)
+
+
+def test_cache_keyed_by_token(cached_service):
+    url = cached_service.get_api_url("rpms", "python-ogr")
+    cached_service.should_receive("get_raw_request").and_return(
+        RequestResponse(200, True, b"{}", json={"name": "python-ogr"}),
+    ).twice()
+
+    cached_service.call_api(url)
+    cached_service.change_token("ghijkl")
+    cached_service.call_api(url)
+
+
+def test_username_cached_per_token():
+    service = PagureService(token="abcdef", instance_url="https://pagure.io")
+    flexmock(service).should_receive("call_api").and_return(
+        {"username": "alice"},
+    ).and_return({"username": "bob"}).twice()
+
+    assert service.user.get_username() == "alice"
+    assert service.user.get_username() == "alice"
+    service.change_token("ghijkl")
+    assert service.user.get_username() == "bob"
+    assert service.user.get_username() == "bob"
+
+
+def test_cache_disabled_by_default():
+    service = PagureService(instance_url="https://pagure.io")
+    url = service.get_api_url("rpms", "python-ogr")
+    flexmock(service).should_receive("get_raw_request").and_return(
+        RequestResponse(200, True, b"{}", json={"name": "python-ogr"}),
+    ).twice()
+
+    service.call_api(url)
+    service.call_api(url)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_pr_list_fetches_all_pages(max_workers):
+    service = PagureService(instance_url="https://pagure.io", max_workers=max_workers)
+    project = flexmock(
+        service.get_project(namespace="rpms", repo="kernel", username="x"),
+    )
+
+    def pull_requests(*args, params):
+        page = params["page"]
+        return {
+            "requests": [{"id": page * 10}, {"id": page * 10 + 1}],
+            "pagination": {"next": page < 3 or None, "pages": 3},
+        }
+
+    project.should_receive("_call_project_api").replace_with(pull_requests).times(3)
+
+    assert [pr.id for pr in project.get_pr_list()] == [10, 11, 20, 21, 30, 31]
+
+
+def test_can_merge_pr_uses_access_snapshot():
+    service = flexmock(
+        PagureService(instance_url="https://pagure.io", acl_cache_ttl=60),
+    )
+    project = flexmock(service.get_project(namespace="rpms", repo="ogr", username="x"))
+    project.should_receive("get_project_info").and_return(
+        {
+            "access_users": {
+                "admin": ["admin"],
+                "commit": [],
+                "ticket": ["reporter"],
+                "owner": ["owner"],
+            },
+            "access_groups": {
+                "admin": ["admins"],
+                "commit": ["packagers"],
+                "ticket": ["triagers"],
+            },
+        },
+    ).once()
+    for group, members in (("admins", ["alice"]), ("packagers", ["bob"])):
+        service.should_receive("get_group").with_args(group).and_return(
+            flexmock(members=members),
+        ).once()
+
+    assert project.can_merge_pr("alice")
+    assert project.can_merge_pr("bob")
+    assert not project.can_merge_pr("reporter")
+    assert project.users_with_write_access() == {"admin", "owner", "alice", "bob"}
+    assert project.who_can_close_issue() == {"admin", "owner", "reporter"}
+
+
+def test_access_lists_not_cached_by_default():
+    service = flexmock(PagureService(instance_url="https://pagure.io"))
+    project = flexmock(service.get_project(namespace="rpms", repo="ogr", username="x"))
+    project.should_receive("get_project_info").and_return(
+        {"access_users": {"owner": ["owner"]}, "access_groups": {}},
+    ).twice()
+
+    project.get_owners().append("intruder")
+    assert project.get_owners() == ["owner"]
+
+
+def test_acl_change_drops_cached_group_members():
+    service = flexmock(
+        PagureService(instance_url="https://pagure.io", acl_cache_ttl=60),
+    )
+    project = flexmock(service.get_project(namespace="rpms", repo="ogr", username="x"))
+    service.should_receive("get_group").with_args("packagers").and_return(
+        flexmock(members=["alice"]),
+    ).and_return(flexmock(members=[])).twice()
+    project.should_receive("_call_project_api_raw").and_return(
+        RequestResponse(200, True, b"{}"),
+    )
+
+    assert service.get_group_members("packagers") == ["alice"]
+    project.add_group("packagers", AccessLevel.push)
+    assert service.get_group_members("packagers") == []
+
+
+@pytest.fixture
+def project_with_tree():
+    service = PagureService(instance_url="https://pagure.io")
+    project = flexmock(service.get_project(namespace="rpms", repo="ogr", username="x"))
+    tree = {
+        ".": [("README.md", "file"), ("a", "folder"), ("b", "folder")],
+        "a": [("a/main.c", "file"), ("a/c", "folder")],
+        "a/c": [("a/c/lib.c", "file")],
+        "b": [("b/notes.txt", "file")],
+    }
+
+    def call_project_api(*args):
+        path = "/".join(args[3:]) if len(args) > 2 else "."
+        return {
+            "content": [{"path": name, "type": kind} for name, kind in tree[path]],
+        }
+
+    project.should_receive("_call_project_api").replace_with(call_project_api)
+    return project
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_get_files_recursive(project_with_tree, max_workers):
+    project_with_tree.service.max_workers = max_workers
+    # the order of the sequential walk
+    assert project_with_tree.get_files(ref="main", recursive=True) == [
+        "README.md",
+        "b/notes.txt",
+        "a/main.c",
+        "a/c/lib.c",
+    ]
+    assert project_with_tree.get_files(ref="main") == ["README.md"]
+    assert project_with_tree.get_files(
+        ref="main",
+        filter_regex=r"\.c$",
+        recursive=True,
+    ) == ["a/main.c", "a/c/lib.c"]
+
+
+def test_iter_files_stops_early(project_with_tree):
+    paths = project_with_tree.iter_files(
+        ref="main",
+        filter_regex=r"\.c$",
+        recursive=True,
+    )
+    assert next(paths).endswith(".c")
+    paths.close()
+
+
+@pytest.mark.parametrize(("exists", "create"), [(True, False), (False, False)])
+def test_get_fork_checks_fork_directly(exists, create):
+    service = PagureService(instance_url="https://pagure.io")
+    project = service.get_project(namespace="rpms", repo="ogr", username="user")
+    flexmock(service).should_receive("call_api_raw").with_args(
+        url="https://pagure.io/api/0/fork/user/rpms/ogr",
+        method=None,
+        params=None,
+        data=None,
+    ).and_return(RequestResponse(200 if exists else 404, exists, b"{}")).once()
+    flexmock(PagureProject).should_receive("get_forks").never()
+
+    fork = project.get_fork(create=create)
+    assert bool(fork) == exists
+
+
+def test_get_forks_filtered_by_owner():
+    service = PagureService(instance_url="https://pagure.io")
+    project = service.get_project(namespace="rpms", repo="ogr", username="user")
+    flexmock(service).should_receive("call_api").and_return(
+        {
+            "projects": [
+                {"name": "ogr", "namespace": "rpms", "user": {"name": "alice"}},
+                {"name": "ogr", "namespace": "rpms", "user": {"name": "bob"}},
+                {"name": "ogr", "namespace": "modules", "user": {"name": "bob"}},
+            ],
+        },
+    )
+
+    assert len(project.get_forks()) == 2
+    assert [fork._username for fork in project.get_forks(owner="bob")] == ["bob"]
+
+
+def test_session_pool_and_timeouts():
+    service = PagureService(
+        instance_url="https://pagure.io",
+        pool_maxsize=32,
+        timeout=(3.05, 30),
+    )
+    adapter = service.session.get_adapter("https://pagure.io")
+    assert adapter is service.session.get_adapter("http://pagure.io")
+    assert adapter._pool_maxsize == 32
+
+    url = service.get_api_url("version")
+    flexmock(service.session).should_receive("request").with_args(
+        method="GET",
+        url=url,
+        params=None,
+        headers={},
+        data=None,
+        verify=True,
+        timeout=(3.05, 30),
+    ).and_return(
+        flexmock(status_code=200, ok=True, content=b"{}", reason="OK", headers={}),
+    )
+    flexmock(service.session).should_receive("request").with_args(
+        method="GET",
+        url=url,
+        params=None,
+        headers={},
+        data=None,
+        verify=True,
+        timeout=1,
+    ).and_raise(requests.exceptions.ReadTimeout)
+
+    service.call_api_raw(url)
+    with pytest.raises(OgrNetworkError):
+        service.call_api_raw(url, timeout=1)
+
+
+def test_latest_commit_statuses_per_context():
+    project = PagureProject(
+        namespace="rpms",
+        repo="python-ogr",
+        service=PagureService(instance_url="https://pagure.io"),
+    )
+
+    def flag(context, status, date_created):
+        return {
+            "commit_hash": "abcdef",
+            "comment": "",
+            "status": status,
+            "username": context,
+            "url": "",
+            "date_created": str(date_created),
+        }
+
+    flexmock(project).should_receive("_call_project_api").and_return(
+        {
+            "flags": [
+                flag("ci", "failure", 1),
+                flag("ci", "success", 3),
+                flag("lint", "pending", 2),
+            ],
+        },
+    ).once()
+
+    assert sorted(
+        (flag.context, flag.state.name)
+        for flag in project.get_latest_commit_statuses("abcdef")
+    ) == [("ci", "success"), ("lint", "pending")]
+
+
+def test_save_archive_not_supported():
+    service = PagureService(token="abcdef", instance_url="https://pagure.io")
+    project = PagureProject(repo="ogr", namespace=None, service=service)
+    release = PagureRelease(GitTag("0.1.0", "abcdef"), project)
+
+    with pytest.raises(OperationNotSupported):
+        release.save_archive("ogr-0.1.0.tar.gz")
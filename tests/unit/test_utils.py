@@ -2,11 +2,25 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
+from flexmock import flexmock
 
 from ogr.abstract import PRComment
-from ogr.utils import filter_comments, search_in_comments
+from ogr.exceptions import ChecksumMismatchError
+from ogr.utils import (
+    RequestResponse,
+    SingleFlight,
+    TTLCache,
+    download_file,
+    filter_comments,
+    search_in_comments,
+)
 
 
 @pytest.fixture
@@ -79,3 +93,214 @@ def test_search_in_comments(comments, filter_str, starts_with, number_of_groups)
     else:
         assert len(match.regs) == number_of_groups
         assert match.string.startswith(starts_with)
+
+
+def test_ttl_cache_expiration():
+    cache = TTLCache(max_size=4, ttl=10)
+    flexmock(time).should_receive("monotonic").and_return(100).and_return(
+        105,
+    ).and_return(111)
+
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    assert cache.get("key") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache()
+    cache.set(("project", 1), 1)
+    cache.set(("project", 2), 2)
+    cache.set(("other", 1), 3)
+
+    assert cache.invalidate(lambda key: key[0] == "project") == 2
+    assert len(cache) == 1
+    assert ("other", 1) in cache
+
+
+def test_request_response_decodes_json_lazily():
+    response = RequestResponse(
+        200,
+        True,
+        b'{"name": "ogr"}',
+        headers=[("Content-Type", "application/json")],
+    )
+    flexmock(json).should_receive("loads").and_return({"name": "ogr"}).once()
+
+    assert "not decoded" in str(response)
+    assert response.json() == {"name": "ogr"}
+    assert response.json_content == {"name": "ogr"}
+
+
+def test_request_response_decodes_json_once_across_threads():
+    response = RequestResponse(200, True, b'{"name": "ogr"}')
+    decoded = []
+
+    def loads(content):
+        decoded.append(content)
+        time.sleep(0.01)
+        return {"name": "ogr"}
+
+    flexmock(json).should_receive("loads").replace_with(loads)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: response.json_content, range(4)))
+
+    assert len(decoded) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_request_response_binary_body():
+    content = b"From 1234 Mon Sep 17 00:00:00 2001\n"
+    response = RequestResponse(
+        200,
+        True,
+        content,
+        headers=[("content-type", "text/x-diff")],
+    )
+    flexmock(json).should_receive("loads").never()
+
+    assert response.json_content is None
+    assert response.body.obj is content
+    assert bytes(response.body) == content
+
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.reason = "OK" if self.ok else "ERROR"
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+
+ARCHIVE = b"0123456789" * 10
+ARCHIVE_SHA256 = hashlib.sha256(ARCHIVE).hexdigest()
+
+
+def test_download_file(tmp_path):
+    session = flexmock()
+    session.should_receive("get").with_args(
+        "https://example.com/archive.tar.gz",
+        headers={},
+        stream=True,
+    ).and_return(FakeResponse(200, ARCHIVE)).once()
+    target = tmp_path / "archive.tar.gz"
+
+    digest = download_file(
+        session,
+        "https://example.com/archive.tar.gz",
+        str(target),
+        chunk_size=16,
+        checksum=ARCHIVE_SHA256,
+    )
+
+    assert digest == ARCHIVE_SHA256
+    assert target.read_bytes() == ARCHIVE
+
+
+@pytest.mark.parametrize(
+    ("status_code", "content"),
+    [(206, ARCHIVE[40:]), (200, ARCHIVE), (416, b"")],
+)
+def test_download_file_resume(tmp_path, status_code, content):
+    target = tmp_path / "archive.tar.gz"
+    target.write_bytes(ARCHIVE if status_code == 416 else ARCHIVE[:40])
+    session = flexmock()
+    session.should_receive("get").with_args(
+        "https://example.com/archive.tar.gz",
+        headers={"Range": f"bytes={target.stat().st_size}-"},
+        stream=True,
+    ).and_return(FakeResponse(status_code, content)).once()
+
+    download_file(
+        session,
+        "https://example.com/archive.tar.gz",
+        str(target),
+        chunk_size=16,
+        checksum=ARCHIVE_SHA256,
+        resume=True,
+    )
+
+    assert target.read_bytes() == ARCHIVE
+
+
+def test_download_file_checksum_mismatch(tmp_path):
+    session = flexmock()
+    session.should_receive("get").and_return(FakeResponse(200, b"corrupted"))
+
+    with pytest.raises(ChecksumMismatchError):
+        download_file(
+            session,
+            "https://example.com/archive.tar.gz",
+            str(tmp_path / "archive.tar.gz"),
+            checksum=ARCHIVE_SHA256,
+        )
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {"name": "ogr"}
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight.do("key", fetch)),
+    )
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(single_flight.do("key", fetch)))
+        for _ in range(3)
+    ]
+    for follower in followers:
+        follower.start()
+    while single_flight.coalesced < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"name": "ogr"}] * 4
+    assert single_flight.stats == {"calls": 1, "coalesced": 3}
+
+    assert single_flight.do("key", lambda: "again") == "again"
+    assert single_flight.calls == 2
+
+
+def test_single_flight_shares_exception():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError("error")
+
+    with pytest.raises(ValueError, match="error"):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: 42) == 42